@@ -1,10 +1,14 @@
+import os
 import sys
-import numpy as np
 from PySide6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout,
                               QHBoxLayout, QLabel, QSpinBox, QDoubleSpinBox)
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 from matplotlib.figure import Figure
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from dspcore import DSPParams, DSPPipeline, ResultCache
+from dspui import UpdateScheduler, lod
+
 class DSPApp(QMainWindow):
     def __init__(self):
         super().__init__()
@@ -76,11 +80,17 @@ class DSPApp(QMainWindow):
         self.info_label = QLabel()
         layout.addWidget(self.info_label)
 
+        # Settings revisited while scrubbing are served from the cache
+        self.pipeline = DSPPipeline(results=ResultCache())
+
+        # Bursts of control changes are merged into one update per frame
+        self.scheduler = UpdateScheduler(self.update_plot, parent=self)
+
         # Connect signals
-        self.freq_spin.valueChanged.connect(self.update_plot)
-        self.amp_spin.valueChanged.connect(self.update_plot)
-        self.samp_freq_spin.valueChanged.connect(self.update_plot)
-        self.quant_spin.valueChanged.connect(self.update_plot)
+        self.freq_spin.valueChanged.connect(self.scheduler.request)
+        self.amp_spin.valueChanged.connect(self.scheduler.request)
+        self.samp_freq_spin.valueChanged.connect(self.scheduler.request)
+        self.quant_spin.valueChanged.connect(self.scheduler.request)
 
         # Initial plot
         self.update_plot()
@@ -89,40 +99,33 @@ class DSPApp(QMainWindow):
         self.figure.clear()
 
         # Signal parameters
-        freq = self.freq_spin.value()
-        amp = self.amp_spin.value()
-        fs = self.samp_freq_spin.value()
-        bits = self.quant_spin.value()
-
-        # Time vector for analog signal
-        t = np.linspace(0, 0.5, 1000)
-        analog_signal = amp * np.sin(2 * np.pi * freq * t)
-
-        # Sampling
-        ts = np.arange(0, 0.5, 1/fs)
-        sampled_signal = amp * np.sin(2 * np.pi * freq * ts)
-
-        # Quantization
-        levels = 2**bits
-        quantized_signal = np.round(sampled_signal * (levels-1)/2) * 2/(levels-1)
+        params = DSPParams(freq=self.freq_spin.value(),
+                           amp=self.amp_spin.value(),
+                           fs=self.samp_freq_spin.value(),
+                           bits=self.quant_spin.value())
+        result = self.pipeline.run(params)
+        t, ts = result.t, result.ts
+        analog_signal = result.analog
+        sampled_signal = result.sampled
+        quantized_signal = result.quantized
 
         # Plotting
         ax1 = self.figure.add_subplot(311)
-        ax1.plot(t, analog_signal, 'b-', label='Analog Signal')
-        ax1.plot(ts, sampled_signal, 'r.', label='Sampled Points')
+        lod.plot(ax1, t, analog_signal, 'b-', label='Analog Signal')
+        lod.plot(ax1, ts, sampled_signal, 'r.', label='Sampled Points')
         ax1.set_title('Analog Signal and Sampling')
         ax1.grid(True)
         ax1.legend()
 
         ax2 = self.figure.add_subplot(312)
-        ax2.plot(ts, sampled_signal, 'b-', label='Original Samples')
-        ax2.plot(ts, quantized_signal, 'r--', label='Quantized Signal')
+        lod.plot(ax2, ts, sampled_signal, 'b-', label='Original Samples')
+        lod.plot(ax2, ts, quantized_signal, 'r--', label='Quantized Signal')
         ax2.set_title('Quantization')
         ax2.grid(True)
         ax2.legend()
 
         ax3 = self.figure.add_subplot(313)
-        ax3.stem(ts, quantized_signal, label='Digital Signal')
+        lod.stem(ax3, ts, quantized_signal, label='Digital Signal')
         ax3.set_title('Digital Signal')
         ax3.grid(True)
         ax3.legend()
@@ -130,16 +133,14 @@ class DSPApp(QMainWindow):
         self.canvas.draw()
 
         # Update information
-        nyquist = fs/2
-        if freq > nyquist:
-            alias_freq = abs(freq - fs * round(freq/fs))
-            alias_info = f"Aliasing detected! Alias frequency: {alias_freq:.1f} Hz"
+        if result.aliased:
+            alias_info = f"Aliasing detected! Alias frequency: {result.alias_freq:.1f} Hz"
         else:
             alias_info = "No aliasing"
 
-        info_text = (f"Nyquist frequency: {nyquist} Hz\n"
+        info_text = (f"Nyquist frequency: {result.nyquist} Hz\n"
                     f"{alias_info}\n"
-                    f"Quantization levels: {levels}")
+                    f"Quantization levels: {result.levels}")
         self.info_label.setText(info_text)
 
 if __name__ == '__main__':
@@ -1,13 +1,33 @@
+import os
 import sys
+import time
+from dataclasses import replace
 import numpy as np
-from PySide6.QtWidgets import *
-from PySide6.QtCore import QTimer
+from PySide6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout,
+                              QHBoxLayout, QLabel, QSpinBox, QDoubleSpinBox,
+                              QComboBox, QPushButton, QCheckBox, QTabWidget,
+                              QLineEdit, QFileDialog, QProgressDialog)
+from PySide6.QtCore import Qt, QTimer
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 from matplotlib.figure import Figure
-from matplotlib.animation import FuncAnimation
-import scipy.signal
-import scipy.io.wavfile
-import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from dspcore import DSPParams, DSPPipeline, ResultCache, eye_diagram
+from dspcore.bits import format_bits
+from dspcore.export import EXPORT_FORMATS, export_stream
+from dspcore.pipeline import PCM_ENCODINGS
+from dspcore.profiling import Profiler
+from dspcore.quantizer import COMPANDING, QUANTIZER_MODES
+from dspcore.spectrum import rfft_spectrum
+from dspcore.stft import IncrementalSTFT, segment_length
+from dspcore.stream import StreamingPipeline
+from dspcore.lod import LODPyramid
+from dspcore.params import parse_values
+from dspui import (BackgroundTask, BlitManager, ComputeWorker, LODLine, UpdateScheduler,
+                   fit_limits, overlay)
+
+ANIMATION_STEPS = 63  # phase steps per cycle, about 0.1 rad each
+RESULT_CACHE_BYTES = 64 << 20
 
 class DSPApp(QMainWindow):
     def __init__(self):
@@ -30,7 +50,7 @@ class DSPApp(QMainWindow):
         self.time_figure = Figure(figsize=(12, 8))
         self.time_canvas = FigureCanvas(self.time_figure)
         time_layout.addWidget(self.time_canvas)
-        self.tab_widget.addTab(time_tab, "Time Domain")
+        self.time_tab_index = self.tab_widget.addTab(time_tab, "Time Domain")
 
         # Frequency domain tab
         freq_tab = QWidget()
@@ -38,7 +58,7 @@ class DSPApp(QMainWindow):
         self.freq_figure = Figure(figsize=(12, 8))
         self.freq_canvas = FigureCanvas(self.freq_figure)
         freq_layout.addWidget(self.freq_canvas)
-        self.tab_widget.addTab(freq_tab, "Frequency Domain")
+        self.freq_tab_index = self.tab_widget.addTab(freq_tab, "Frequency Domain")
 
         # Add Digital Analysis tab
         digital_tab = QWidget()
@@ -46,7 +66,15 @@ class DSPApp(QMainWindow):
         self.digital_figure = Figure(figsize=(12, 8))
         self.digital_canvas = FigureCanvas(self.digital_figure)
         digital_layout.addWidget(self.digital_canvas)
-        self.tab_widget.addTab(digital_tab, "Digital Analysis")
+        self.digital_tab_index = self.tab_widget.addTab(digital_tab, "Digital Analysis")
+
+        # Spectrogram tab
+        spectrogram_tab = QWidget()
+        spectrogram_layout = QVBoxLayout(spectrogram_tab)
+        self.spectrogram_figure = Figure(figsize=(12, 8))
+        self.spectrogram_canvas = FigureCanvas(self.spectrogram_figure)
+        spectrogram_layout.addWidget(self.spectrogram_canvas)
+        self.spectrogram_tab_index = self.tab_widget.addTab(spectrogram_tab, "Spectrogram")
 
         # Create controls
         controls_layout = QHBoxLayout()
@@ -76,6 +104,21 @@ class DSPApp(QMainWindow):
         amp_layout.addWidget(self.amp_spin)
         signal_group.addLayout(amp_layout)
 
+        # Channel count and the channels overlaid on the time and frequency
+        # tabs; the digital and spectrogram tabs follow the first one shown
+        channel_layout = QHBoxLayout()
+        self.channels_spin = QSpinBox()
+        self.channels_spin.setRange(1, 64)
+        self.channels_spin.setValue(1)
+        self.channels_spin.setToolTip("Channel k lags channel 0 by k/channels of a cycle")
+        self.channel_edit = QLineEdit()
+        self.channel_edit.setPlaceholderText("all, or e.g. 0,2,4:7")
+        channel_layout.addWidget(QLabel("Channels:"))
+        channel_layout.addWidget(self.channels_spin)
+        channel_layout.addWidget(QLabel("Show:"))
+        channel_layout.addWidget(self.channel_edit)
+        signal_group.addLayout(channel_layout)
+
         # Sampling frequency control
         sampling_group = QVBoxLayout()
         controls_layout.addLayout(sampling_group)
@@ -99,6 +142,18 @@ class DSPApp(QMainWindow):
         quant_layout.addWidget(self.quant_spin)
         sampling_group.addLayout(quant_layout)
 
+        # Quantizer characteristic and companding law
+        quantizer_layout = QHBoxLayout()
+        self.quantizer_combo = QComboBox()
+        self.quantizer_combo.addItems(list(QUANTIZER_MODES))
+        self.companding_combo = QComboBox()
+        self.companding_combo.addItems(list(COMPANDING))
+        quantizer_layout.addWidget(QLabel("Quantizer:"))
+        quantizer_layout.addWidget(self.quantizer_combo)
+        quantizer_layout.addWidget(QLabel("Companding:"))
+        quantizer_layout.addWidget(self.companding_combo)
+        sampling_group.addLayout(quantizer_layout)
+
         # Add advanced controls
         advanced_group = QVBoxLayout()
         controls_layout.addLayout(advanced_group)
@@ -131,15 +186,25 @@ class DSPApp(QMainWindow):
         self.animate_btn = QPushButton("Toggle Animation")
         self.animate_btn.setCheckable(True)
         anim_layout.addWidget(self.animate_btn)
+        self.stream_check = QCheckBox("Live stream (causal filter)")
+        self.stream_check.setToolTip(
+            "Animate by streaming new samples through the filter block by block")
+        anim_layout.addWidget(self.stream_check)
         advanced_group.addLayout(anim_layout)
 
         # Export controls
         export_layout = QHBoxLayout()
         self.export_btn = QPushButton("Export")
         self.export_combo = QComboBox()
-        self.export_combo.addItems(["WAV", "CSV", "NPY", "MAT"])
+        self.export_combo.addItems(list(EXPORT_FORMATS))
+        self.export_duration_spin = QDoubleSpinBox()
+        self.export_duration_spin.setRange(0.01, 3600)
+        self.export_duration_spin.setValue(0.5)
+        self.export_duration_spin.setSuffix(" s")
         export_layout.addWidget(self.export_btn)
         export_layout.addWidget(self.export_combo)
+        export_layout.addWidget(QLabel("Duration:"))
+        export_layout.addWidget(self.export_duration_spin)
         advanced_group.addLayout(export_layout)
 
         # Add Digital Signal Controls
@@ -150,7 +215,7 @@ class DSPApp(QMainWindow):
         pcm_layout = QHBoxLayout()
         pcm_label = QLabel("PCM Encoding:")
         self.pcm_combo = QComboBox()
-        self.pcm_combo.addItems(["Unipolar", "Polar NRZ", "Bipolar RZ"])
+        self.pcm_combo.addItems(list(PCM_ENCODINGS))
         pcm_layout.addWidget(pcm_label)
         pcm_layout.addWidget(self.pcm_combo)
         digital_group.addLayout(pcm_layout)
@@ -165,209 +230,505 @@ class DSPApp(QMainWindow):
         filter_order_layout.addWidget(self.filter_order_spin)
         digital_group.addLayout(filter_order_layout)
 
-        # Information display
+        # Information display, with the profiling overlay beside it
+        info_layout = QHBoxLayout()
         self.info_label = QLabel()
-        layout.addWidget(self.info_label)
+        info_layout.addWidget(self.info_label, 1)
+        self.profile_label = QLabel()
+        self.profile_label.setStyleSheet("font-family: monospace")
+        self.profile_label.setVisible(False)
+        info_layout.addWidget(self.profile_label, 1)
+        profile_buttons = QVBoxLayout()
+        self.profile_check = QCheckBox("Profile")
+        self.profile_check.setToolTip("Time every processing and drawing stage of each frame")
+        self.memory_check = QCheckBox("Memory")
+        self.memory_check.setToolTip("Also track peak memory per frame; tracing every "
+                                     "allocation slows the stages it times")
+        self.memory_check.setEnabled(False)
+        self.trace_btn = QPushButton("Save Trace")
+        self.trace_btn.setEnabled(False)
+        profile_buttons.addWidget(self.profile_check)
+        profile_buttons.addWidget(self.memory_check)
+        profile_buttons.addWidget(self.trace_btn)
+        profile_buttons.addStretch()
+        info_layout.addLayout(profile_buttons)
+        layout.addLayout(info_layout)
+
+        # Bursts of control changes are merged into one update per frame
+        self.scheduler = UpdateScheduler(self.update_plot, parent=self)
 
         # Connect signals
-        self.freq_spin.valueChanged.connect(self.update_plot)
-        self.amp_spin.valueChanged.connect(self.update_plot)
-        self.samp_freq_spin.valueChanged.connect(self.update_plot)
-        self.quant_spin.valueChanged.connect(self.update_plot)
-        self.window_combo.currentTextChanged.connect(self.update_plot)
-        self.filter_combo.currentTextChanged.connect(self.update_plot)
-        self.cutoff_spin.valueChanged.connect(self.update_plot)
+        self.freq_spin.valueChanged.connect(self.scheduler.request)
+        self.amp_spin.valueChanged.connect(self.scheduler.request)
+        self.channels_spin.valueChanged.connect(self.scheduler.request)
+        self.channel_edit.editingFinished.connect(self.select_channels)
+        self.samp_freq_spin.valueChanged.connect(self.scheduler.request)
+        self.quant_spin.valueChanged.connect(self.scheduler.request)
+        self.quantizer_combo.currentTextChanged.connect(self.scheduler.request)
+        self.companding_combo.currentTextChanged.connect(self.scheduler.request)
+        self.window_combo.currentTextChanged.connect(self.scheduler.request)
+        self.filter_combo.currentTextChanged.connect(self.scheduler.request)
+        self.cutoff_spin.valueChanged.connect(self.scheduler.request)
         self.animate_btn.toggled.connect(self.toggle_animation)
+        self.stream_check.toggled.connect(self.scheduler.request)
         self.export_btn.clicked.connect(self.export_signal)
-        self.pcm_combo.currentTextChanged.connect(self.update_plot)
-        self.filter_order_spin.valueChanged.connect(self.update_plot)
+        self.profile_check.toggled.connect(self.toggle_profiling)
+        self.memory_check.toggled.connect(self.toggle_memory_tracing)
+        self.trace_btn.clicked.connect(self.save_trace)
+        self.pcm_combo.currentTextChanged.connect(self.scheduler.request)
+        self.filter_order_spin.valueChanged.connect(self.scheduler.request)
+        self.tab_widget.currentChanged.connect(self.render_tab)
 
         # Animation timer
         self.timer = QTimer()
         self.timer.timeout.connect(self.update_animation)
+        # The phase cycles through a fixed set of steps, so after one cycle
+        # every animation frame is served from the result cache
         self.animation_phase = 0
+        self.animation_step = 0
+        # Fraction of a sample left over from earlier stream ticks
+        self.stream_carry = 0.0
+
+        # Stage timers stay disabled (and free) until profiling is switched on
+        self.profiler = Profiler()
+        self.profile_refreshed = 0.0
+        # Recently seen parameter sets (scrubbing, animation cycles) are
+        # served without rerunning the chain
+        self.results = ResultCache(max_bytes=RESULT_CACHE_BYTES)
+        self.pipeline = DSPPipeline(profiler=self.profiler, results=self.results)
+        # Used instead of the pipeline in live-stream mode; only ever touched
+        # from the worker thread
+        self.stream = StreamingPipeline(profiler=self.profiler)
+        self.export_task = None
+        # Incremental STFT state, also worker-thread only
+        self.stft = None
+        self.stft_params = None
+        self.stft_position = None
+
+        # Axes and artists are created once; update_plot only pushes new data
+        self.build_figures()
+
+        # Only the visible tab is drawn; a tab is dirty while the parameters
+        # it shows differ from the controls, and is refreshed when shown
+        self.result = None
+        self.tab_computers = {
+            self.time_tab_index: self.compute_time_tab,
+            self.freq_tab_index: self.compute_freq_tab,
+            self.digital_tab_index: self.compute_digital_tab,
+            self.spectrogram_tab_index: self.compute_spectrogram_tab,
+        }
+        self.tab_renderers = {
+            self.time_tab_index: self.draw_time_tab,
+            self.freq_tab_index: self.draw_freq_tab,
+            self.digital_tab_index: self.draw_digital_tab,
+            self.spectrogram_tab_index: self.draw_spectrogram_tab,
+        }
+        self.drawn_params = {}
+        self.deferred_loaded = False
+
+        # Numeric work runs off the GUI thread; only artist updates stay here
+        self.worker = ComputeWorker(parent=self)
+        self.worker.resultReady.connect(self.show_frame)
+        self.worker.failed.connect(self.show_error)
 
         # Initial plot
         self.update_plot()
 
-    def apply_window(self, signal):
-        window_type = self.window_combo.currentText()
-        if window_type == "None":
-            return signal
-        N = len(signal)
-        if window_type == "Hamming":
-            window = np.hamming(N)
-        elif window_type == "Hanning":
-            window = np.hanning(N)
-        else:  # Blackman
-            window = np.blackman(N)
-        return signal * window
-
-    def apply_filter(self, signal, fs):
-        filter_type = self.filter_combo.currentText()
-        if filter_type == "None":
-            return signal
-        
-        cutoff = self.cutoff_spin.value()
-        nyquist = fs / 2
-        normalized_cutoff = cutoff / nyquist
-
-        if filter_type == "Lowpass":
-            b, a = scipy.signal.butter(4, normalized_cutoff, btype='low')
-        elif filter_type == "Highpass":
-            b, a = scipy.signal.butter(4, normalized_cutoff, btype='high')
-        else:  # Bandpass
-            b, a = scipy.signal.butter(4, [normalized_cutoff*0.5, normalized_cutoff], btype='band')
-        
-        return scipy.signal.filtfilt(b, a, signal)
+    def current_params(self):
+        return DSPParams(
+            freq=self.freq_spin.value(),
+            amp=self.amp_spin.value(),
+            fs=self.samp_freq_spin.value(),
+            bits=self.quant_spin.value(),
+            quantizer=self.quantizer_combo.currentText(),
+            companding=self.companding_combo.currentText(),
+            phase=self.animation_phase if self.animate_btn.isChecked() else 0.0,
+            window=self.window_combo.currentText(),
+            filter=self.filter_combo.currentText(),
+            cutoff=self.cutoff_spin.value(),
+            order=self.filter_order_spin.value(),
+            pcm=self.pcm_combo.currentText(),
+            channels=self.channels_spin.value())
+
+    def shown_channels(self, count):
+        # Indices typed into the Show box that exist; all channels otherwise
+        try:
+            wanted = parse_values(self.channel_edit.text(), int, limit=count)
+        except (ValueError, OverflowError):
+            wanted = []
+        shown = np.unique([c for c in wanted if 0 <= c < count])
+        return shown if shown.size else np.arange(count)
+
+    def select_channels(self):
+        # Only the drawing changes, but every tab has to pick it up
+        self.drawn_params.clear()
+        self.update_plot()
 
     def update_animation(self):
-        self.animation_phase += 0.1
+        # Let the previous frame land before advancing, so slow frames are
+        # skipped rather than queued
+        if self.worker.busy():
+            return
+        if self.stream_check.isChecked():
+            # Advance by the samples that arrived during one timer interval,
+            # carrying the fraction over so the stream keeps the sampling rate
+            self.drawn_params.clear()
+            self.stream_carry += self.samp_freq_spin.value() * self.timer.interval() / 1000
+            advance = int(self.stream_carry)
+            self.stream_carry -= advance
+            self.request_tab(self.tab_widget.currentIndex(), advance)
+            return
+        self.animation_step = (self.animation_step + 1) % ANIMATION_STEPS
+        self.animation_phase = 2 * np.pi * self.animation_step / ANIMATION_STEPS
         self.update_plot()
 
     def toggle_animation(self, checked):
         if checked:
+            self.stream_carry = 0.0
             self.timer.start(50)
         else:
             self.timer.stop()
 
-    def update_plot(self):
-        # Clear both figures
-        self.time_figure.clear()
-        self.freq_figure.clear()
-
-        # Generate and process signal
-        freq = self.freq_spin.value()
-        amp = self.amp_spin.value()
-        fs = self.samp_freq_spin.value()
-        bits = self.quant_spin.value()
-
-        # Time vectors
-        t = np.linspace(0, 0.5, 1000)
-        ts = np.arange(0, 0.5, 1/fs)
-
-        # Generate signal with animation phase
-        if self.animate_btn.isChecked():
-            analog_signal = amp * np.sin(2 * np.pi * freq * t + self.animation_phase)
-            sampled_signal = amp * np.sin(2 * np.pi * freq * ts + self.animation_phase)
-        else:
-            analog_signal = amp * np.sin(2 * np.pi * freq * t)
-            sampled_signal = amp * np.sin(2 * np.pi * freq * ts)
-
-        # Apply window and filter
-        processed_signal = self.apply_window(sampled_signal)
-        processed_signal = self.apply_filter(processed_signal, fs)
-
-        # Quantization
-        levels = 2**bits
-        quantized_signal = np.round(processed_signal * (levels-1)/2) * 2/(levels-1)
-
-        # Time domain plotting
+    def build_figures(self):
+        # Time domain
         ax1 = self.time_figure.add_subplot(211)
-        ax1.plot(t, analog_signal, 'b-', label='Analog Signal')
-        ax1.plot(ts, sampled_signal, 'r.', label='Sampled Points')
+        self.analog_line, = ax1.plot([], [], 'b-', label='Analog Signal')
+        self.sampled_line, = ax1.plot([], [], 'r.', label='Sampled Points')
+        self.reconstructed_line, = ax1.plot([], [], 'm--', label='Reconstructed (sinc)')
         ax1.set_title('Time Domain Analysis')
         ax1.grid(True)
         ax1.legend()
 
         ax2 = self.time_figure.add_subplot(212)
-        ax2.plot(ts, processed_signal, 'g-', label='Processed Signal')
-        ax2.plot(ts, quantized_signal, 'r--', label='Quantized Signal')
+        self.processed_line, = ax2.plot([], [], 'g-', label='Processed Signal')
+        self.quantized_line, = ax2.plot([], [], 'r--', label='Quantized Signal')
         ax2.grid(True)
         ax2.legend()
 
-        # Frequency domain plotting
-        fft_result = np.fft.fft(quantized_signal)
-        freq_axis = np.fft.fftfreq(len(ts), 1/fs)
-
+        # Frequency domain
         ax3 = self.freq_figure.add_subplot(211)
-        ax3.magnitude_spectrum(quantized_signal, Fs=fs)
+        self.magnitude_line, = ax3.plot([], [])
         ax3.set_title('Magnitude Spectrum')
+        ax3.set_xlabel('Frequency')
+        ax3.set_ylabel('Magnitude (energy)')
 
         ax4 = self.freq_figure.add_subplot(212)
-        ax4.phase_spectrum(quantized_signal, Fs=fs)
+        self.phase_line, = ax4.plot([], [])
         ax4.set_title('Phase Spectrum')
+        ax4.set_xlabel('Frequency')
+        ax4.set_ylabel('Phase (radians)')
 
-        self.time_canvas.draw()
-        self.freq_canvas.draw()
-
-        # Digital signal processing
-        digital_signal = self.encode_pcm(quantized_signal)
-        
-        # Binary representation
-        binary_values = np.round((digital_signal + 1) * ((2**bits - 1) / 2)).astype(int)
-        binary_strings = [format(val, f'0{bits}b') for val in binary_values]
+        # Digital domain
+        self.ax_pcm = self.digital_figure.add_subplot(311)
+        self.pcm_line, = self.ax_pcm.plot([], [], 'g-', drawstyle='steps-post', label='PCM Signal')
+        # The line-coded waveform runs to bits * samples_per_bit points per sample
+        self.pcm_lod = LODLine(self.pcm_line)
+        self.ax_pcm.grid(True)
+        self.ax_pcm.legend()
 
-        # Digital domain plotting
-        self.digital_figure.clear()
-        
-        # PCM waveform
-        ax_pcm = self.digital_figure.add_subplot(311)
-        ax_pcm.step(ts, digital_signal, 'g-', label='PCM Signal')
-        ax_pcm.set_title(f'PCM Encoding ({self.pcm_combo.currentText()})')
-        ax_pcm.grid(True)
-        ax_pcm.legend()
-
-        # Binary representation
         ax_bin = self.digital_figure.add_subplot(312)
-        binary_display = binary_strings[:20]  # Show first 20 samples
-        ax_bin.text(0.1, 0.5, ' '.join(binary_display), fontfamily='monospace')
+        self.binary_text = ax_bin.text(0.1, 0.5, '', fontfamily='monospace')
         ax_bin.set_title('Binary Representation (first 20 samples)')
         ax_bin.axis('off')
 
-        # Eye diagram
-        ax_eye = self.digital_figure.add_subplot(313)
-        self.plot_eye_diagram(digital_signal, fs, ax_eye)
-        
-        self.digital_canvas.draw()
+        # Eye diagram as a single persistence image
+        self.ax_eye = self.digital_figure.add_subplot(313)
+        self.eye_image = self.ax_eye.imshow(np.ma.masked_all((1, 1)), aspect='auto',
+                                            origin='lower', cmap='viridis',
+                                            interpolation='nearest',
+                                            extent=(0, 2, -1, 1))
+        self.eye_text = self.ax_eye.text(0.01, 0.95, '', transform=self.ax_eye.transAxes,
+                                         va='top', fontsize='small', fontfamily='monospace')
+        self.ax_eye.set_xlim(0, 2)
+        self.ax_eye.set_title('Eye Diagram')
+        self.ax_eye.grid(True)
+        self.ax_eye.set_xlabel('Symbol Period')
+        self.ax_eye.set_ylabel('Amplitude')
+
+        # Spectrogram (rolling image) and running Welch PSD
+        self.ax_spec = self.spectrogram_figure.add_subplot(211)
+        self.spec_image = self.ax_spec.imshow(np.zeros((1, 1)), aspect='auto', origin='lower',
+                                              cmap='magma', interpolation='nearest')
+        self.ax_spec.set_title('Spectrogram')
+        self.ax_spec.set_xlabel('Time (s)')
+        self.ax_spec.set_ylabel('Frequency (Hz)')
+        self.spectrogram_figure.colorbar(self.spec_image, ax=self.ax_spec, label='dB/Hz')
+
+        ax_psd = self.spectrogram_figure.add_subplot(212)
+        self.psd_line, = ax_psd.plot([], [], label='Welch PSD')
+        ax_psd.set_title('Running Welch PSD')
+        ax_psd.set_xlabel('Frequency (Hz)')
+        ax_psd.set_ylabel('PSD (dB/Hz)')
+        ax_psd.grid(True)
+
+        self.time_blit = BlitManager(self.time_canvas, [
+            self.analog_line, self.sampled_line, self.reconstructed_line, self.processed_line,
+            self.quantized_line])
+        self.freq_blit = BlitManager(self.freq_canvas, [self.magnitude_line, self.phase_line])
+        self.digital_blit = BlitManager(self.digital_canvas, [
+            self.pcm_line, self.binary_text, self.eye_image, self.eye_text])
+        self.spectrogram_blit = BlitManager(self.spectrogram_canvas,
+                                            [self.spec_image, self.psd_line])
 
-        # Update information display
-        nyquist = fs/2
-        if freq > nyquist:
-            alias_freq = abs(freq - fs * round(freq/fs))
+    def update_plot(self):
+        self.request_tab(self.tab_widget.currentIndex())
+
+    def render_tab(self, index):
+        if self.drawn_params.get(index) != self.current_params():
+            self.request_tab(index)
+
+    def load_deferred_modules(self):
+        # dspcore imports scipy on first use, which keeps it out of startup.
+        # Extension modules first imported on a worker thread can crash the
+        # process mid-run, though, so they are loaded here on the GUI
+        # thread: once the first frame is up, or before any job that may
+        # need them, whichever comes first.
+        if self.deferred_loaded:
+            return
+        import scipy.signal  # noqa: F401 (also loads scipy.fft)
+        self.deferred_loaded = True
+
+    def request_tab(self, index, advance=0):
+        params = self.current_params()
+        # Only time-tab frames without a filter run without scipy; anything
+        # else, and every frame after the first, loads it here first
+        if (self.result is not None or index != self.time_tab_index
+                or params.filter != "None"):
+            self.load_deferred_modules()
+        self.profiler.begin_frame()
+        self.worker.submit(self.compute_frame, params, index, self.stream_check.isChecked(),
+                           advance, self.shown_channels(params.channels))
+
+    def compute_frame(self, params, index, streaming=False, advance=0, shown=None):
+        # Runs on the worker thread: no widget access from here on
+        if streaming:
+            result = self.stream.run(params, advance)
+        else:
+            result = self.pipeline.run(params)
+        shown = np.arange(params.channels) if shown is None else shown
+        return index, result, self.tab_computers[index](result, shown)
+
+    def show_frame(self, frame):
+        index, result, data = frame
+        if self.result is None:
+            QTimer.singleShot(0, self.load_deferred_modules)
+        self.result = result
+        self.drawn_params[index] = result.params
+        with self.profiler.stage("draw"):
+            self.tab_renderers[index](result, data)
+
+        # Update information display (identical for every channel)
+        aliased, alias_freq, levels = (np.ravel(v)[0] for v in
+                                       (result.aliased, result.alias_freq, result.levels))
+        if aliased:
             alias_info = f"Aliasing detected! Alias frequency: {alias_freq:.1f} Hz"
         else:
             alias_info = "No aliasing"
 
-        info_text = (f"Nyquist frequency: {nyquist} Hz\n"
+        # SQNR and reconstruction error averaged over the channels
+        info_text = (f"Nyquist frequency: {result.nyquist} Hz\n"
                     f"{alias_info}\n"
                     f"Quantization levels: {levels}\n"
-                    f"Average bit rate: {freq * bits} bps")
+                    f"SQNR: {np.mean(result.sqnr_db):.1f} dB measured, "
+                    f"{np.mean(result.sqnr_theory_db):.1f} dB theoretical\n"
+                    f"Reconstruction error: {np.mean(result.reconstruction_error_db):.1f} dB\n"
+                    f"Average bit rate: {result.bit_rate:.0f} bps")
+        if result.params.channels > 1:
+            info_text += f" per channel, {result.params.channels} channels"
         self.info_label.setText(info_text)
 
-    def encode_pcm(self, quantized_signal):
-        encoding = self.pcm_combo.currentText()
-        digital_signal = np.zeros_like(quantized_signal)
-        
-        if encoding == "Unipolar":
-            digital_signal = (quantized_signal + 1) / 2
-        elif encoding == "Polar NRZ":
-            digital_signal = quantized_signal
-        else:  # Bipolar RZ
-            for i in range(len(quantized_signal)):
-                if quantized_signal[i] > 0:
-                    digital_signal[i] = 1 if i % 2 == 0 else -1
-                elif quantized_signal[i] < 0:
-                    digital_signal[i] = -1 if i % 2 == 0 else 1
-        
-        return digital_signal
+        self.profiler.end_frame()
+        # The overlay itself is refreshed a few times a second at most
+        if self.profiler.enabled and time.perf_counter() - self.profile_refreshed > 0.25:
+            self.profile_refreshed = time.perf_counter()
+            self.profile_label.setText(self.profile_text())
+
+    def show_error(self, exc):
+        self.info_label.setText(f"Processing error: {exc}")
+
+    def compute_time_tab(self, result, shown):
+        return shown
+
+    def draw_time_tab(self, result, shown):
+        # Each artist draws every shown channel as one NaN-separated line
+        t, ts = result.t, result.ts
+        rows = {name: np.atleast_2d(getattr(result, name))[shown]
+                for name in ("analog", "sampled", "reconstructed", "processed", "quantized")}
+        self.analog_line.set_data(*overlay(t, rows["analog"]))
+        self.sampled_line.set_data(*overlay(ts, rows["sampled"]))
+        self.reconstructed_line.set_data(*overlay(t, rows["reconstructed"]))
+        self.processed_line.set_data(*overlay(ts, rows["processed"]))
+        self.quantized_line.set_data(*overlay(ts, rows["quantized"]))
+        relayout = fit_limits(self.analog_line.axes, t,
+                              np.concatenate([rows["analog"].ravel(), rows["sampled"].ravel()]))
+        relayout |= fit_limits(self.processed_line.axes, ts,
+                               np.concatenate([rows["processed"].ravel(),
+                                               rows["quantized"].ravel()]))
+        if relayout:
+            self.time_blit.invalidate()
+        with self.profiler.stage("canvas"):
+            self.time_blit.update()
+
+    def compute_freq_tab(self, result, shown):
+        # One batched rfft over the shown channels feeds both plots
+        with self.profiler.stage("fft"):
+            spectrum = rfft_spectrum(np.atleast_2d(result.quantized)[shown], result.params.fs)
+        return spectrum.freqs, spectrum.magnitude, spectrum.phase
+
+    def draw_freq_tab(self, result, data):
+        freqs, magnitude, phase = data
+        self.magnitude_line.set_data(*overlay(freqs, magnitude))
+        self.phase_line.set_data(*overlay(freqs, phase))
+        # While animating, the unwrapped phase drifts frame to frame; give the
+        # axes a full cycle before they shrink, so they settle on one range
+        patience = ANIMATION_STEPS if self.animate_btn.isChecked() else 0
+        relayout = fit_limits(self.magnitude_line.axes, freqs, magnitude, patience=patience)
+        relayout |= fit_limits(self.phase_line.axes, freqs, phase, patience=patience)
+        if relayout:
+            self.freq_blit.invalidate()
+        with self.profiler.stage("canvas"):
+            self.freq_blit.update()
+
+    def compute_digital_tab(self, result, shown):
+        params = result.params
+        channel = shown[0]
+        digital = np.atleast_2d(result.digital)[channel]
+
+        # Binary representation: strings only for the visible samples
+        bit_matrix = result.bit_matrix if params.channels == 1 else result.bit_matrix[channel]
+        binary_display = format_bits(bit_matrix[:20])  # Show first 20 samples
+
+        with self.profiler.stage("eye"):
+            eye = eye_diagram(digital, params.samples_per_bit, y_range=(-1.2, 1.2), metrics=True)
+        with self.profiler.stage("lod"):
+            pyramid = LODPyramid(result.tb, digital)
+        return ' '.join(binary_display), eye, pyramid, channel
+
+    def draw_digital_tab(self, result, data):
+        binary_text, eye, pcm_pyramid, channel = data
+        params = result.params
 
-    def plot_eye_diagram(self, signal, fs, ax):
-        # Create eye diagram
-        samples_per_symbol = int(fs / (self.freq_spin.value() * 2))
-        num_symbols = len(signal) // samples_per_symbol
-        
-        for i in range(num_symbols - 1):
-            start_idx = i * samples_per_symbol
-            end_idx = start_idx + samples_per_symbol * 2
-            if end_idx <= len(signal):
-                t = np.linspace(0, 2, samples_per_symbol * 2)
-                ax.plot(t, signal[start_idx:end_idx], 'b-', alpha=0.1)
-        
-        ax.set_title('Eye Diagram')
-        ax.grid(True)
-        ax.set_xlabel('Symbol Period')
-        ax.set_ylabel('Amplitude')
+        # PCM waveform
+        self.pcm_lod.set_pyramid(pcm_pyramid)
+        relayout = fit_limits(self.ax_pcm, *pcm_pyramid.levels[0])
+        title = f'PCM Encoding ({params.pcm})'
+        if params.channels > 1:
+            title += f', channel {channel}'
+        if self.ax_pcm.get_title() != title:
+            self.ax_pcm.set_title(title)
+            relayout = True
+
+        self.binary_text.set_text(binary_text)
+
+        # Eye diagram (log density so sparse traces stay visible)
+        density = np.log1p(np.ma.masked_equal(eye.counts, 0))
+        self.eye_image.set_data(density)
+        self.eye_image.set_extent((eye.x_edges[0], eye.x_edges[-1],
+                                   eye.y_edges[0], eye.y_edges[-1]))
+        self.eye_image.set_clim(0, max(float(density.max()), 1.0) if density.count() else 1.0)
+        metrics = eye.metrics
+        self.eye_text.set_text(f"{eye.traces} traces  opening {metrics.height:.2f}  "
+                               f"Q {metrics.q_factor:.1f}  jitter {metrics.jitter_rms:.3f} UI rms")
+        relayout |= fit_limits(self.ax_eye, [0, 2], eye.y_edges[[0, -1]])
+        if relayout:
+            self.digital_blit.invalidate()
+        with self.profiler.stage("canvas"):
+            self.digital_blit.update()
+
+    def compute_spectrogram_tab(self, result, shown):
+        params = result.params
+        channel = shown[0]
+        if (self.stft is None
+                or (self.stft.fs, self.stft.window_type) != (params.fs, params.window)):
+            self.stft = IncrementalSTFT(params.fs, segment_length(params.fs), window=params.window)
+            self.stft_params = None
+
+        # Streams only contribute the samples produced since the last push;
+        # anything else (a new stream, a static frame) is pushed whole
+        samples = np.atleast_2d(result.processed)[channel]
+        state = (replace(params, phase=0.0), channel)
+        continuing = state == self.stft_params
+        if continuing and result.position is not None and self.stft_position is not None:
+            new = min(max(result.position - self.stft_position, 0), samples.size)
+            samples = samples[samples.size - new:]
+        if not continuing:
+            self.stft.restart()
+        elif result.position is None:
+            # Static frames are independent records of the same signal
+            self.stft.restart(keep_psd=True)
+        self.stft_params = state
+        self.stft_position = result.position
+        with self.profiler.stage("stft"):
+            self.stft.push(samples)
+
+        tiny = np.finfo(float).tiny
+        return (10 * np.log10(self.stft.spectrogram() + tiny), self.stft.times(),
+                self.stft.freqs, 10 * np.log10(self.stft.psd() + tiny))
+
+    def draw_spectrogram_tab(self, result, data):
+        image, times, freqs, psd = data
+        step = times[1] - times[0] if times.size > 1 else 1.0
+        extent = (times[0] - step / 2, times[-1] + step / 2, freqs[0], freqs[-1])
+        self.spec_image.set_data(image)
+        self.spec_image.set_extent(extent)
+        # Colour scale moves in 10 dB steps so the colorbar is rarely redrawn
+        top = 10 * np.ceil(image.max() / 10)
+        relayout = self.spec_image.get_clim() != (top - 80, top)
+        self.spec_image.set_clim(top - 80, top)
+        relayout |= fit_limits(self.ax_spec, extent[:2], extent[2:])
+        self.psd_line.set_data(freqs, psd)
+        relayout |= fit_limits(self.psd_line.axes, freqs, psd)
+        if relayout:
+            self.spectrogram_blit.invalidate()
+        with self.profiler.stage("canvas"):
+            self.spectrogram_blit.update()
+
+    def toggle_profiling(self, checked):
+        self.profiler.set_enabled(checked)
+        self.profile_label.setText("Waiting for frames..." if checked else "")
+        self.profile_label.setVisible(checked)
+        self.trace_btn.setEnabled(checked)
+        self.memory_check.setEnabled(checked)
+
+    def toggle_memory_tracing(self, checked):
+        # Timings taken with and without tracing are not comparable
+        self.profiler.set_memory_tracing(checked)
+        self.profiler.reset()
+
+    def profile_text(self):
+        summary = self.profiler.summary()
+        lines = [f"{'stage':<10}{'last':>8}{'mean':>8}{'max':>8} ms"]
+        for name, stats in summary["stages"].items():
+            lines.append(f"{name:<10}{stats['last_ms']:8.2f}{stats['mean_ms']:8.2f}"
+                         f"{stats['max_ms']:8.2f}")
+        frame = summary["frame"]
+        if frame:
+            lines.append(f"frame p50 {frame['p50_ms']:.1f}  p95 {frame['p95_ms']:.1f}  "
+                         f"max {frame['max_ms']:.1f} ms  {frame['fps']:.1f} fps")
+            counts, edges = self.profiler.histogram(bins=6)
+            for count, lo, hi in zip(counts, edges[:-1], edges[1:]):
+                bar = '#' * int(round(20 * count / max(counts.max(), 1)))
+                lines.append(f"{lo:6.1f}-{hi:<6.1f} {bar} {count}")
+        if self.profiler.trace_memory:
+            lines.append(f"peak memory {summary['frame_peak_bytes'] / 2**20:.1f} MB/frame, "
+                         f"{summary['peak_bytes'] / 2**20:.1f} MB max")
+        info = self.results.cache_info()
+        lines.append(f"result cache {100 * self.results.hit_rate:.0f}% hits, "
+                     f"{info.currsize} entries, "
+                     f"{info.currbytes / 2**20:.1f}/{info.maxbytes / 2**20:.0f} MB")
+        return '\n'.join(lines)
+
+    def save_trace(self):
+        filename, _ = QFileDialog.getSaveFileName(self, "Save Profiling Trace", "trace.json",
+                                                  "Trace files (*.json)")
+        if not filename:
+            return
+        try:
+            events = self.profiler.dump(filename)
+        except OSError as exc:
+            self.statusBar().showMessage(f"Saving trace failed: {exc}")
+        else:
+            self.statusBar().showMessage(f"Saved {events} trace events to {filename}", 5000)
 
     def export_signal(self):
         export_type = self.export_combo.currentText()
@@ -377,31 +738,35 @@ class DSPApp(QMainWindow):
         if not filename:
             return
 
-        # Generate signal data
-        fs = self.samp_freq_spin.value()
-        ts = np.arange(0, 0.5, 1/fs)
-        signal = self.generate_processed_signal(ts)
-
-        if export_type == "WAV":
-            scipy.io.wavfile.write(filename, fs, signal.astype(np.float32))
-        elif export_type == "CSV":
-            pd.DataFrame({'time': ts, 'amplitude': signal}).to_csv(filename, index=False)
-        elif export_type == "NPY":
-            np.save(filename, signal)
-        else:  # MAT
-            scipy.io.savemat(filename, {'signal': signal, 'fs': fs})
-
-    def generate_processed_signal(self, t):
-        freq = self.freq_spin.value()
-        amp = self.amp_spin.value()
-        signal = amp * np.sin(2 * np.pi * freq * t)
-        signal = self.apply_window(signal)
-        signal = self.apply_filter(signal, self.samp_freq_spin.value())
-        # Apply digital filter
-        order = self.filter_order_spin.value()
-        b = np.ones(order) / order  # Moving average filter
-        signal = np.convolve(signal, b, mode='same')
-        return signal
+        # Written chunk by chunk on a pool thread, so long exports neither
+        # hold the whole signal in memory nor block the UI
+        self.load_deferred_modules()
+        task = BackgroundTask(export_stream, filename, export_type, self.current_params(),
+                              self.export_duration_spin.value(), parent=self)
+        dialog = QProgressDialog(f"Exporting {os.path.basename(filename)}...", "Cancel",
+                                 0, 1000, self)
+        dialog.setWindowModality(Qt.WindowModal)
+        dialog.setMinimumDuration(500)
+        dialog.canceled.connect(task.cancel)
+        task.progress.connect(
+            lambda done, total: dialog.setValue(int(1000 * done / max(total, 1))))
+        task.finished.connect(lambda done: self.export_done(task, dialog, filename, done))
+        task.failed.connect(lambda exc: self.export_done(task, dialog, filename, exc))
+        self.export_btn.setEnabled(False)
+        self.export_task = task
+        task.start()
+
+    def export_done(self, task, dialog, filename, outcome):
+        dialog.reset()
+        self.export_btn.setEnabled(True)
+        self.export_task = None
+        task.deleteLater()
+        if isinstance(outcome, Exception):
+            self.statusBar().showMessage(f"Export failed: {outcome}")
+        elif outcome:
+            self.statusBar().showMessage(f"Exported {filename}", 5000)
+        else:
+            self.statusBar().showMessage("Export cancelled", 5000)
 
 if __name__ == '__main__':
     app = QApplication(sys.argv)
@@ -1,11 +1,27 @@
+import os
 import sys
 import numpy as np
 from PySide6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout,
                               QHBoxLayout, QLabel, QSpinBox, QDoubleSpinBox,
-                              QComboBox, QPushButton, QFileDialog)
+                              QComboBox, QPushButton, QFileDialog, QCheckBox)
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 from matplotlib.figure import Figure
-import scipy.fft
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from dspcore import DSPParams, DSPPipeline, ResultCache
+from dspcore.montecarlo import monte_carlo
+from dspcore.oscillator import synthesize
+from dspcore.spectrum import rfft_spectrum
+from dspcore.signalio import estimate_tone, open_signal
+from dspui import ComputeWorker, UpdateScheduler, lod
+
+ESTIMATE_CHUNK_SAMPLES = 1 << 20  # noisy samples per Monte Carlo chunk
+
+
+def set_widened(spin, value):
+    # Set a spin box to ``value``, stretching its range to hold it if needed
+    spin.setRange(min(spin.minimum(), value), max(spin.maximum(), value))
+    spin.setValue(value)
 
 class DSPApp(QMainWindow):
     def __init__(self):
@@ -38,6 +54,10 @@ class DSPApp(QMainWindow):
         self.type_combo.addItems(["Sine", "Square", "Triangle"])
         type_layout.addWidget(type_label)
         type_layout.addWidget(self.type_combo)
+        self.bandlimited_check = QCheckBox("Band-limited")
+        self.bandlimited_check.setToolTip(
+            "Sample Square/Triangle with PolyBLEP corrections instead of the ideal shape")
+        type_layout.addWidget(self.bandlimited_check)
         signal_group.addLayout(type_layout)
 
         # Frequency control
@@ -105,90 +125,101 @@ class DSPApp(QMainWindow):
         button_layout.addWidget(self.load_button)
         layout.addLayout(button_layout)
 
+        self.pipeline = DSPPipeline()
+        # The plotted noise is one fixed realisation, so redraws of the same
+        # settings agree; the SNR shown is a Monte Carlo mean over many
+        self.noise_seed = 0
+        self.trials = 500
+        # Both are deterministic for a given seed, so revisited settings are
+        # served from the cache
+        self.results = ResultCache()
+        # The estimate runs off the GUI thread and fills in the SNR line when
+        # it arrives; a newer request drops any estimate still in flight
+        self.estimator = ComputeWorker(parent=self)
+        self.estimator.resultReady.connect(self.show_estimate)
+        self.estimator.failed.connect(self.estimate_failed)
+        self.info_text = ""
+
+        # Bursts of control changes are merged into one update per frame
+        self.scheduler = UpdateScheduler(self.update_plot, parent=self)
+
         # Connect signals
-        self.freq_spin.valueChanged.connect(self.update_plot)
-        self.amp_spin.valueChanged.connect(self.update_plot)
-        self.samp_freq_spin.valueChanged.connect(self.update_plot)
-        self.quant_spin.valueChanged.connect(self.update_plot)
-        self.type_combo.currentTextChanged.connect(self.update_plot)
-        self.phase_spin.valueChanged.connect(self.update_plot)
+        self.freq_spin.valueChanged.connect(self.scheduler.request)
+        self.amp_spin.valueChanged.connect(self.scheduler.request)
+        self.samp_freq_spin.valueChanged.connect(self.scheduler.request)
+        self.quant_spin.valueChanged.connect(self.scheduler.request)
+        self.type_combo.currentTextChanged.connect(self.scheduler.request)
+        self.bandlimited_check.toggled.connect(self.scheduler.request)
+        self.phase_spin.valueChanged.connect(self.scheduler.request)
         self.save_button.clicked.connect(self.save_signal)
         self.load_button.clicked.connect(self.load_signal)
 
         # Initial plot
         self.update_plot()
 
-    def generate_signal(self, t, freq, amp, phase_deg):
-        phase_rad = np.deg2rad(phase_deg)
-        signal_type = self.type_combo.currentText()
-        
-        if signal_type == "Sine":
-            return amp * np.sin(2 * np.pi * freq * t + phase_rad)
-        elif signal_type == "Square":
-            return amp * np.sign(np.sin(2 * np.pi * freq * t + phase_rad))
-        else:  # Triangle
-            return amp * (2/np.pi) * np.arcsin(np.sin(2 * np.pi * freq * t + phase_rad))
+    def current_params(self):
+        return DSPParams(
+            freq=self.freq_spin.value(),
+            amp=self.amp_spin.value(),
+            fs=self.samp_freq_spin.value(),
+            bits=self.quant_spin.value(),
+            phase=np.deg2rad(self.phase_spin.value()),
+            waveform=self.type_combo.currentText(),
+            bandlimited=self.bandlimited_check.isChecked(),
+            noise=0.1)
+
+    def compute(self, params):
+        self.pipeline.rng = np.random.default_rng(self.noise_seed)
+        return self.pipeline.run(params)
+
+    def estimate(self, params, seed, samples):
+        # Worker thread. Chunks hold about ESTIMATE_CHUNK_SAMPLES noisy
+        # samples, so long recordings do not allocate every trial at once
+        chunk_size = max(ESTIMATE_CHUNK_SAMPLES // max(samples, 1), 1)
+        return self.results.get(
+            ("estimate", params, seed),
+            lambda: monte_carlo(params, params.noise, self.trials, processes=0, seed=seed,
+                                chunk_size=chunk_size))
 
     def update_plot(self):
         self.figure.clear()
         
-        # Signal parameters
-        freq = self.freq_spin.value()
-        amp = self.amp_spin.value()
-        fs = self.samp_freq_spin.value()
-        bits = self.quant_spin.value()
-        phase = self.phase_spin.value()
-
-        # Time vector for analog signal
-        t = np.linspace(0, 0.5, 1000)
-        analog_signal = self.generate_signal(t, freq, amp, phase)
-
-        # Sampling
-        ts = np.arange(0, 0.5, 1/fs)
-        sampled_signal = self.generate_signal(ts, freq, amp, phase)
-
-        # Add some noise to sampled signal
-        noise = np.random.normal(0, 0.1, len(sampled_signal))
-        noisy_signal = sampled_signal + noise
-
-        # Quantization
-        levels = 2**bits
-        quantized_signal = np.round(noisy_signal * (levels-1)/2) * 2/(levels-1)
-
-        # Calculate SNR
-        signal_power = np.mean(sampled_signal**2)
-        noise_power = np.mean((noisy_signal - sampled_signal)**2)
-        snr_db = 10 * np.log10(signal_power/noise_power)
-
-        # FFT Analysis
-        fft_result = scipy.fft.fft(quantized_signal)
-        freq_axis = scipy.fft.fftfreq(len(ts), 1/fs)
+        # Signal chain (noise is added to the sampled signal before quantization)
+        params = self.current_params()
+        result = self.results.get((params, self.noise_seed), lambda: self.compute(params))
+        fs = params.fs
+        t, ts = result.t, result.ts
+        analog_signal = result.analog
+        sampled_signal = result.sampled
+        noisy_signal = result.processed
+        quantized_signal = result.quantized
+
+        # FFT Analysis (unwindowed, unnormalized magnitude)
+        spectrum = rfft_spectrum(quantized_signal, fs, window="None")
 
         # Plotting (now 2x2 grid)
         ax1 = self.figure.add_subplot(221)
-        ax1.plot(t, analog_signal, 'b-', label='Analog Signal')
-        ax1.plot(ts, sampled_signal, 'r.', label='Sampled Points')
+        lod.plot(ax1, t, analog_signal, 'b-', label='Analog Signal')
+        lod.plot(ax1, ts, sampled_signal, 'r.', label='Sampled Points')
         ax1.set_title('Analog Signal and Sampling')
         ax1.grid(True)
         ax1.legend()
 
         ax2 = self.figure.add_subplot(222)
-        ax2.plot(ts, noisy_signal, 'b-', label='Noisy Signal')
-        ax2.plot(ts, quantized_signal, 'r--', label='Quantized Signal')
+        lod.plot(ax2, ts, noisy_signal, 'b-', label='Noisy Signal')
+        lod.plot(ax2, ts, quantized_signal, 'r--', label='Quantized Signal')
         ax2.set_title('Quantization')
         ax2.grid(True)
         ax2.legend()
 
         ax3 = self.figure.add_subplot(223)
-        ax3.stem(ts, quantized_signal, label='Digital Signal')
+        lod.stem(ax3, ts, quantized_signal, label='Digital Signal')
         ax3.set_title('Digital Signal')
         ax3.grid(True)
         ax3.legend()
 
         ax4 = self.figure.add_subplot(224)
-        ax4.plot(freq_axis[:len(freq_axis)//2], 
-                np.abs(fft_result)[:len(freq_axis)//2], 
-                label='FFT')
+        lod.plot(ax4, spectrum.freqs, np.abs(spectrum.values), label='FFT')
         ax4.set_title('Frequency Spectrum')
         ax4.grid(True)
         ax4.legend()
@@ -196,33 +227,62 @@ class DSPApp(QMainWindow):
         self.canvas.draw()
 
         # Update information
-        nyquist = fs/2
-        if freq > nyquist:
-            alias_freq = abs(freq - fs * round(freq/fs))
-            alias_info = f"Aliasing detected! Alias frequency: {alias_freq:.1f} Hz"
+        if result.aliased:
+            alias_info = f"Aliasing detected! Alias frequency: {result.alias_freq:.1f} Hz"
         else:
             alias_info = "No aliasing"
 
-        info_text = (f"Nyquist frequency: {nyquist} Hz\n"
-                    f"{alias_info}\n"
-                    f"Quantization levels: {levels}\n"
-                    f"SNR: {snr_db:.2f} dB")
-        self.info_label.setText(info_text)
+        self.info_text = (f"Nyquist frequency: {result.nyquist} Hz\n"
+                          f"{alias_info}\n"
+                          f"Quantization levels: {result.levels}\n")
+        self.info_label.setText(self.info_text + "SNR: estimating...")
+        self.estimator.submit(self.estimate, params, self.noise_seed, result.ts.size)
+
+    def show_estimate(self, estimate):
+        self.info_label.setText(
+            self.info_text
+            + f"SNR: {estimate['snr_db'][0]:.2f} dB "
+            f"(95% CI {estimate['snr_db_lo'][0]:.2f} to {estimate['snr_db_hi'][0]:.2f} dB, "
+            f"{estimate['trials'][0]} trials), SQNR: {estimate['sqnr_db'][0]:.2f} dB, "
+            f"BER: {estimate['ber'][0]:.3g}")
+
+    def estimate_failed(self, exc):
+        self.info_label.setText(self.info_text + f"SNR: estimate failed ({exc})")
 
     def save_signal(self):
         filename, _ = QFileDialog.getSaveFileName(self, "Save Signal", "", "NPY files (*.npy)")
         if filename:
-            ts = np.arange(0, 0.5, 1/self.samp_freq_spin.value())
-            signal = self.generate_signal(ts, self.freq_spin.value(), 
-                                       self.amp_spin.value(), 
-                                       self.phase_spin.value())
+            params = self.current_params()
+            n = len(np.arange(0, 0.5, 1/params.fs))
+            signal = synthesize(n, params.fs, params.freq, params.amp, params.phase,
+                                params.waveform, params.bandlimited)
             np.save(filename, signal)
 
     def load_signal(self):
-        filename, _ = QFileDialog.getOpenFileName(self, "Load Signal", "", "NPY files (*.npy)")
+        filename, _ = QFileDialog.getOpenFileName(self, "Load Signal", "",
+                                                  "Signal files (*.npy *.wav)")
         if filename:
-            loaded_signal = np.load(filename)
-            # TODO: Implement signal loading and parameter estimation
+            # Memory-mapped, so only the estimation segment is actually read
+            try:
+                samples, fs = open_signal(filename)
+                fs = fs or self.samp_freq_spin.value()  # .npy files carry no rate
+                tone = estimate_tone(samples, fs, self.type_combo.currentText())
+            except (OSError, ValueError) as exc:
+                self.statusBar().showMessage(f"Could not load {os.path.basename(filename)}: {exc}")
+                return
+
+            # Recordings routinely run past the controls' usual ranges (8 or
+            # 44.1 kHz WAVs, kHz tones); widen them instead of clamping, so
+            # the controls, and later .npy loads, keep the file's values
+            set_widened(self.samp_freq_spin, int(round(fs)))
+            set_widened(self.freq_spin, int(round(tone.freq)))
+            set_widened(self.amp_spin, tone.amp)
+            self.phase_spin.setValue(np.rad2deg(tone.phase) % 360)
+            self.statusBar().showMessage(
+                f"{os.path.basename(filename)}: {samples.shape[0]} samples at {fs} Hz, "
+                f"estimated {tone.freq:.3f} Hz, amplitude {tone.amp:.3f}, "
+                f"phase {np.rad2deg(tone.phase):.1f}°")
+            self.scheduler.cancel()
             self.update_plot()
 
 if __name__ == '__main__':
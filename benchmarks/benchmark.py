@@ -0,0 +1,279 @@
+"""Stage-by-stage timings of the DSP chain and the three apps' redraws.
+
+Runs headless (``QT_QPA_PLATFORM=offscreen``) over a matrix of sampling
+rates, bit depths and signal lengths and writes the timings to JSON.
+``--compare`` checks a run against an earlier JSON file and exits non-zero
+when any stage got slower than ``--threshold``. Cold start of each app (a
+fresh interpreter until its first frame is on screen) is checked against
+``--startup-budget``.
+
+    python benchmarks/benchmark.py -o bench.json
+    python benchmarks/benchmark.py -o new.json --compare bench.json
+"""
+import argparse
+import importlib.util
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir)
+sys.path.insert(0, ROOT)
+import numpy as np
+import scipy
+import matplotlib
+
+from dspcore import DesignCache, DSPParams, eye_diagram
+from dspcore.bits import unpack_codes
+from dspcore.linecode import line_code
+from dspcore.pipeline import apply_filter, apply_window, generate, time_vectors
+from dspcore.reconstruct import reconstruct
+from dspcore.spectrum import rfft_spectrum
+
+APPS = {
+    "beginner": "Beginner/signalgui1.py",
+    "intermediate": "Intermidiate/sinalgui2.py",
+    "expert": "Expert/main.py",
+}
+
+
+def measure(fn, repeat):
+    # Milliseconds per call: one warm-up, then ``repeat`` timed calls
+    fn()
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - start) * 1e3)
+    return {"median_ms": statistics.median(times), "min_ms": min(times), "repeat": repeat}
+
+
+def pipeline_stages(params):
+    # The chain of DSPPipeline._run, one callable per stage, each fed the
+    # previous stage's output
+    t, ts = time_vectors(params.fs, params.duration, params.n_analog)
+    sampled = generate(ts, params.freq, params.amp)
+    windowed = apply_window(sampled, params.window)
+    filtered = apply_filter(windowed, params.fs, params.filter, params.cutoff, params.order)
+    cache = DesignCache()
+    kernel = cache.reconstruction(t[1] * params.fs, t.size, ts.size)
+    quantizer = cache.quantizer(params.bits, params.quantizer, params.companding)
+    codes = quantizer.encode(filtered)
+    quantized = quantizer.decode(codes)
+    bitstream = unpack_codes(codes, params.bits).reshape(-1)
+    digital = line_code(bitstream, params.pcm, params.samples_per_bit)
+    return {
+        "generate": lambda: (generate(t, params.freq, params.amp),
+                             generate(ts, params.freq, params.amp)),
+        "reconstruct": lambda: reconstruct(sampled, kernel),
+        "window": lambda: apply_window(sampled, params.window),
+        "filter": lambda: apply_filter(windowed, params.fs, params.filter, params.cutoff,
+                                       params.order),
+        "quantize": lambda: quantizer.encode(filtered),
+        "fft": lambda: rfft_spectrum(quantized, params.fs),
+        "pcm": lambda: line_code(unpack_codes(codes, params.bits).reshape(-1), params.pcm,
+                                 params.samples_per_bit),
+        "eye": lambda: eye_diagram(digital, params.samples_per_bit, metrics=True),
+    }
+
+
+def load_app(name):
+    path = os.path.join(ROOT, APPS[name])
+    spec = importlib.util.spec_from_file_location(f"bench_{name}", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+# Run with ``python -c`` in a fresh interpreter, so only the app's own
+# imports are timed: build the window and wait for its first frame (the
+# Expert app computes it on a worker thread)
+STARTUP_PROBE = """
+import importlib.util, sys, time
+from PySide6.QtWidgets import QApplication
+qt_app = QApplication([])
+spec = importlib.util.spec_from_file_location("app", sys.argv[1])
+module = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(module)
+window = module.DSPApp()
+window.show()
+qt_app.processEvents()
+while getattr(window, "result", True) is None:
+    time.sleep(0.002)
+    qt_app.processEvents()
+"""
+
+
+def measure_startup(name, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", STARTUP_PROBE, os.path.join(ROOT, APPS[name])],
+                       check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        times.append((time.perf_counter() - start) * 1e3)
+    return {"median_ms": statistics.median(times), "min_ms": min(times), "repeat": repeat}
+
+
+def app_stages(window, name):
+    # Redraw costs with the widgets set up by the caller; the Expert app is
+    # driven synchronously, bypassing its worker, so only real work is timed
+    if name != "expert":
+        def update():
+            window.update_plot()
+            if hasattr(window, "estimator"):
+                # Include the background estimate, so repeats do not overlap it
+                window.estimator.wait()
+        return {"update_plot": update, "canvas_draw": window.canvas.draw}
+    stages = {}
+    canvases = {window.time_tab_index: ("time", window.time_canvas, window.time_blit),
+                window.freq_tab_index: ("freq", window.freq_canvas, window.freq_blit),
+                window.digital_tab_index: ("digital", window.digital_canvas, window.digital_blit),
+                window.spectrogram_tab_index: ("spectrogram", window.spectrogram_canvas,
+                                               window.spectrogram_blit)}
+    for index, (tab, canvas, blit) in canvases.items():
+        def frame(index=index):
+            window.show_frame(window.compute_frame(window.current_params(), index))
+        stages[f"{tab}_frame"] = frame
+        stages[f"{tab}_canvas_draw"] = canvas.draw
+        stages[f"{tab}_blit"] = blit.update
+    return stages
+
+
+def run(args):
+    results = []
+
+    def record(group, stage, config, timing):
+        results.append({"group": group, "stage": stage, **config, **timing})
+        print(f"{group:>12} {stage:<24} {json.dumps(config):<52} {timing['median_ms']:9.3f} ms")
+
+    for fs in args.fs:
+        for bits in args.bits:
+            for duration in args.durations:
+                params = DSPParams(freq=fs / 10, fs=fs, bits=bits, duration=duration,
+                                   window="Hamming", filter="Lowpass", cutoff=fs / 4)
+                config = {"fs": fs, "bits": bits, "duration": duration}
+                for stage, fn in pipeline_stages(params).items():
+                    record("pipeline", stage, config, measure(fn, args.repeat))
+
+    for name in args.apps:
+        # The apps' default controls: fs 100 Hz, 8 bits, 0.5 s
+        record(name, "startup", {"fs": 100.0, "bits": 8, "duration": 0.5},
+               measure_startup(name, args.startup_repeat))
+
+    if args.apps:
+        from PySide6.QtWidgets import QApplication
+        qt_app = QApplication.instance() or QApplication([])
+        for name in args.apps:
+            module = load_app(name)
+            window = module.DSPApp()
+            # Time real work: the apps' result caches would serve every repeat
+            for cache in {getattr(window, "results", None), window.pipeline.results} - {None}:
+                cache.resize(0)
+            window.show()
+            qt_app.processEvents()
+            for fs in args.fs:
+                for bits in args.bits:
+                    # The apps' controls stop at 2000 Hz and 16 bits
+                    window.samp_freq_spin.setValue(int(min(fs, 2000)))
+                    window.quant_spin.setValue(int(min(bits, 16)))
+                    window.scheduler.cancel()
+                    if hasattr(window, "worker"):
+                        # Let any queued frame land first, so the timed
+                        # frames do not race it
+                        window.worker.wait()
+                        qt_app.processEvents()
+                    config = {"fs": fs, "bits": bits, "duration": 0.5}
+                    for stage, fn in app_stages(window, name).items():
+                        record(name, stage, config, measure(fn, args.repeat))
+            if hasattr(window, "worker"):
+                window.worker.wait()
+            window.close()
+    return results
+
+
+def key(row):
+    return (row["group"], row["stage"], row["fs"], row["bits"], row["duration"])
+
+
+def compare(results, baseline, threshold, min_delta=0.05):
+    # Print new/old median ratios; returns the rows slower than ``threshold``.
+    # Changes under ``min_delta`` ms are timer noise on the smallest stages
+    old = {key(row): row for row in baseline["results"]}
+    slower = []
+    print(f"\n{'group':>12} {'stage':<24} {'fs':>6} {'bits':>4} {'dur':>5} "
+          f"{'old ms':>9} {'new ms':>9} {'ratio':>6}")
+    for row in results:
+        before = old.get(key(row))
+        if before is None:
+            continue
+        ratio = row["median_ms"] / before["median_ms"] if before["median_ms"] > 0 else float('inf')
+        regressed = ratio > threshold and row["median_ms"] - before["median_ms"] > min_delta
+        flag = "  SLOWER" if regressed else ""
+        print(f"{row['group']:>12} {row['stage']:<24} {row['fs']:>6g} {row['bits']:>4} "
+              f"{row['duration']:>5g} {before['median_ms']:9.3f} {row['median_ms']:9.3f} "
+              f"{ratio:6.2f}{flag}")
+        if regressed:
+            slower.append(row)
+    return slower
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-o", "--output", default="benchmark.json")
+    parser.add_argument("--compare", metavar="BASELINE",
+                        help="earlier JSON output to compare against")
+    parser.add_argument("--threshold", type=float, default=1.25,
+                        help="slowdown ratio that counts as a regression (default 1.25)")
+    parser.add_argument("--min-delta", type=float, default=0.05,
+                        help="ignore slowdowns smaller than this many ms (default 0.05)")
+    parser.add_argument("--fs", type=float, nargs="+", default=[100, 500, 2000])
+    parser.add_argument("--bits", type=int, nargs="+", default=[4, 8, 16])
+    parser.add_argument("--durations", type=float, nargs="+", default=[0.5, 5.0])
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--apps", nargs="*", choices=list(APPS), default=list(APPS),
+                        help="apps whose startup and redraws are timed (none with an empty list)")
+    parser.add_argument("--startup-repeat", type=int, default=5)
+    parser.add_argument("--startup-budget", type=float, default=2.5,
+                        help="seconds an app may take from launch to its first frame "
+                             "(default 2.5)")
+    args = parser.parse_args(argv)
+    results = run(args)
+    report = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "platform": platform.platform(),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "scipy": scipy.__version__,
+            "matplotlib": matplotlib.__version__,
+        },
+        "results": results,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=1)
+    print(f"\n{len(results)} timings -> {os.path.abspath(args.output)}")
+
+    status = 0
+    for row in results:
+        if row["stage"] == "startup" and row["median_ms"] > args.startup_budget * 1e3:
+            print(f"{row['group']} takes {row['median_ms'] / 1e3:.2f} s to its first frame, "
+                  f"over the {args.startup_budget:g} s budget")
+            status = 1
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        slower = compare(results, baseline, args.threshold, args.min_delta)
+        if slower:
+            print(f"{len(slower)} stage(s) slower than {args.threshold:g}x the baseline")
+            status = 1
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,8 @@
+"""Qt-free DSP building blocks behind the Beginner, Intermediate and Expert apps."""
+from .design import DesignCache
+from .eye import EyeDiagram, EyeMetrics, eye_diagram
+from .pipeline import DSPParams, DSPPipeline, DSPResult
+from .resultcache import ResultCache
+
+__all__ = ["DesignCache", "EyeDiagram", "EyeMetrics", "DSPParams", "DSPPipeline", "DSPResult",
+           "ResultCache", "eye_diagram"]
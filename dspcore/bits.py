@@ -0,0 +1,43 @@
+"""Bit-level view of PCM integer codes.
+
+Codes are unpacked into a (samples x bits) uint8 matrix with shifts and
+masks, packed for output with ``np.packbits``, and turned into text only for
+the handful of samples that are actually displayed.
+"""
+import numpy as np
+
+
+def unpack_codes(codes, bits):
+    # (..., n) integer codes -> (..., n, bits) uint8 bits, MSB first
+    shifts = np.arange(bits - 1, -1, -1, dtype=np.uint8)
+    return ((np.asarray(codes)[..., None] >> shifts) & 1).astype(np.uint8)
+
+
+# Set bits in each byte value
+_POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+
+def popcount(codes):
+    # Set bits per element of unsigned integer ``codes``, one table lookup
+    # per byte instead of a (..., bits) unpacked matrix
+    codes = np.ascontiguousarray(codes)
+    counts = _POPCOUNT[codes.view(np.uint8).reshape(codes.shape + (codes.itemsize,))]
+    return counts.sum(axis=-1, dtype=np.int64)
+
+
+def pack_bits(bit_matrix):
+    # MSB-first byte stream of the flattened bits (last byte zero-padded)
+    return np.packbits(np.asarray(bit_matrix, dtype=np.uint8).reshape(-1))
+
+
+def format_bits(bit_matrix):
+    # One '0101...' string per row; only call this on the visible slice
+    rows = np.ascontiguousarray(np.asarray(bit_matrix, dtype=np.uint8) + ord('0'))
+    if rows.shape[-1] == 0:
+        return ['' for _ in range(rows.shape[0])]
+    return [s.decode() for s in rows.view(f'S{rows.shape[-1]}').ravel()]
+
+
+def bit_rate(bitstream, samples, fs):
+    # Bits per second carried by ``samples`` PCM samples taken at ``fs``
+    return np.asarray(bitstream).shape[-1] * fs / samples if samples else 0.0
@@ -0,0 +1,137 @@
+"""Bounded LRU cache for filter and window designs.
+
+Redraws and animation ticks keep asking for the same Butterworth sections,
+window vectors, FFT frequency axes, quantizer tables and reconstruction
+kernels; designing them once per (type, cutoff,
+fs, order, length) keeps ``scipy.signal.butter`` out of the hot path.
+``scipy.signal`` itself takes most of a second to import, so it is only
+loaded when the first filter is designed.
+"""
+import threading
+from collections import OrderedDict, namedtuple
+
+import numpy as np
+
+from .quantizer import Quantizer
+from .reconstruct import reconstruction_kernel
+
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "maxsize", "currsize"])
+
+
+class DesignCache:
+    # Cached arrays are shared between callers and must be treated as read-only
+    # (they are not flagged as such because the sosfilt kernels reject it).
+    # Lookups are locked so GUI and worker threads can share one cache.
+    def __init__(self, maxsize=128):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+
+    def _get(self, key, build):
+        with self._lock:
+            return self._get_locked(key, build)
+
+    def _get_locked(self, key, build):
+        try:
+            value = self._entries[key]
+        except KeyError:
+            self.misses += 1
+            value = self._entries[key] = build()
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        else:
+            self.hits += 1
+            self._entries.move_to_end(key)
+        return value
+
+    def sos(self, filter_type, cutoff, fs, order=4):
+        key = ("sos", filter_type, float(cutoff), float(fs), int(order))
+        return self._get(key, lambda: design_butter(filter_type, cutoff, fs, order))
+
+    def zi(self, filter_type, cutoff, fs, order=4):
+        """Steady-state initial conditions for ``scipy.signal.sosfilt``."""
+        key = ("zi", filter_type, float(cutoff), float(fs), int(order))
+        sos = self.sos(filter_type, cutoff, fs, order)
+        import scipy.signal
+        return self._get(key, lambda: scipy.signal.sosfilt_zi(sos))
+
+    def window(self, window_type, N):
+        key = ("window", window_type, int(N))
+        return self._get(key, lambda: make_window(window_type, N))
+
+    def rfft_freqs(self, n, fs):
+        key = ("rfft_freqs", int(n), float(fs))
+        return self._get(key, lambda: np.fft.rfftfreq(n, 1 / fs))
+
+    def quantizer(self, bits, mode="Mid-tread", companding="None"):
+        key = ("quantizer", int(bits), mode, companding)
+        return self._get(key, lambda: Quantizer(bits, mode, companding))
+
+    def reconstruction(self, ratio, points, samples):
+        """Interpolation taps from ``samples`` samples onto ``points`` grid points."""
+        # Rounded so grids built from the same fs and duration share an entry
+        key = ("reconstruction", round(float(ratio), 9), int(points), int(samples))
+        return self._get(key, lambda: reconstruction_kernel(ratio, points, samples))
+
+    def cache_info(self):
+        return CacheInfo(self.hits, self.misses, self.maxsize, len(self._entries))
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+def design_butter(filter_type, cutoff, fs, order=4):
+    import scipy.signal
+    nyquist = fs / 2
+    normalized_cutoff = cutoff / nyquist
+
+    if filter_type == "Lowpass":
+        return scipy.signal.butter(order, normalized_cutoff, btype='low', output='sos')
+    elif filter_type == "Highpass":
+        return scipy.signal.butter(order, normalized_cutoff, btype='high', output='sos')
+    else:  # Bandpass
+        return scipy.signal.butter(order, [normalized_cutoff*0.5, normalized_cutoff],
+                                   btype='band', output='sos')
+
+
+def make_window(window_type, N):
+    if window_type == "Hamming":
+        return np.hamming(N)
+    elif window_type == "Hanning":
+        return np.hanning(N)
+    else:  # Blackman
+        return np.blackman(N)
+
+
+def window_values(window_type, n, N):
+    # Samples ``n`` of the length-``N`` window, matching make_window, without
+    # building the whole window (used when streaming long signals in blocks)
+    if N == 1:
+        return np.ones(np.shape(n))
+    phase = 2 * np.pi * np.asarray(n) / (N - 1)
+    if window_type == "Hamming":
+        return 0.54 - 0.46 * np.cos(phase)
+    elif window_type == "Hanning":
+        return 0.5 - 0.5 * np.cos(phase)
+    else:  # Blackman
+        return 0.42 - 0.5 * np.cos(phase) + 0.08 * np.cos(2 * phase)
+
+
+def settle_length(sos, tol=1e-10):
+    # Samples until the slowest pole's impulse response decays below ``tol``
+    import scipy.signal
+    radius = np.abs(scipy.signal.sos2zpk(sos)[1]).max(initial=0.0)
+    if radius <= 0:
+        return 0
+    if radius >= 1:
+        raise ValueError("Filter is not stable")
+    return int(np.ceil(np.log(tol) / np.log(radius)))
+
+
+# Shared by every pipeline that is not handed its own cache
+default_cache = DesignCache()
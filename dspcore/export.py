@@ -0,0 +1,174 @@
+"""Chunked export of long processed signals.
+
+The sampled signal is regenerated block by block from ``DSPParams``, so an
+export of any length only ever holds ``chunk_size`` samples (plus the filter's
+settling margin) in memory. Writers append each block as it is produced:
+WAV through the ``wave`` module as 16-bit PCM built from the quantizer codes,
+NPY through a memory-mapped array, CSV through ``np.savetxt`` on an open file,
+MAT as a hand-written version 5 file whose variable sizes are known up front.
+"""
+import os
+import wave
+from dataclasses import dataclass
+
+import numpy as np
+
+from .bits import pack_bits, unpack_codes
+from .design import default_cache, settle_length, window_values
+from .oscillator import synthesize
+from .pipeline import apply_filter, generate
+
+EXPORT_FORMATS = ("WAV", "CSV", "NPY", "MAT", "BIN")
+DEFAULT_CHUNK = 1 << 16
+MAT_HEADER = (b"MATLAB 5.0 MAT-file, written by dspcore.export".ljust(116)
+              + b"\0" * 8 + b"\x00\x01IM")  # no subsystem data, version 0x0100, little-endian
+
+
+@dataclass
+class ExportChunk:
+    start: int  # index of the first sample in the whole export
+    ts: np.ndarray
+    processed: np.ndarray
+    codes: np.ndarray  # Quantizer codes, offset binary
+
+
+def sample_count(fs, duration):
+    # Same length as np.arange(0, duration, 1/fs)
+    return max(int(np.ceil(duration / (1 / fs))), 0)
+
+
+def _noise(seed, lo, hi, block):
+    # Noise for samples lo..hi-1, drawn per fixed block so overlapping
+    # requests agree wherever they share samples
+    parts = [np.random.default_rng([seed, k]).normal(0, 1, block)
+             for k in range(lo // block, (hi - 1) // block + 1)]
+    offset = (lo // block) * block
+    return np.concatenate(parts)[lo - offset:hi - offset]
+
+
+def processed_chunks(params, duration=None, chunk_size=DEFAULT_CHUNK, seed=0, cache=None):
+    """Yield the processed, quantized signal in ``ExportChunk`` blocks.
+
+    Each block is generated with a margin on both sides long enough for the
+    filter's impulse response to die out, filtered forwards and backwards,
+    and trimmed, so the blocks join up to the whole-signal result.
+    """
+    cache = cache if cache is not None else default_cache
+    duration = params.duration if duration is None else duration
+    total = sample_count(params.fs, duration)
+    chunk_size = max(int(chunk_size), 1)
+    quantizer = cache.quantizer(params.bits, params.quantizer, params.companding)
+    margin = 0
+    if params.filter != "None":
+        margin = settle_length(cache.sos(params.filter, params.cutoff, params.fs, params.order))
+
+    for start in range(0, total, chunk_size):
+        stop = min(start + chunk_size, total)
+        lo, hi = max(start - margin, 0), min(stop + margin, total)
+        n = np.arange(lo, hi)
+        ts = n / params.fs
+        if params.bandlimited:
+            # Phase at sample lo, wrapped before it can lose precision
+            cycles = params.freq * lo / params.fs
+            signal = synthesize(n.size, params.fs, params.freq, params.amp,
+                                params.phase + 2 * np.pi * (cycles - np.floor(cycles)),
+                                params.waveform)
+        else:
+            signal = generate(ts, params.freq, params.amp, params.phase, params.waveform)
+        if params.noise > 0:
+            signal = signal + _noise(seed, lo, hi, chunk_size) * params.noise
+        if params.window != "None":
+            signal = signal * window_values(params.window, n, total)
+        signal = apply_filter(signal, params.fs, params.filter, params.cutoff,
+                              params.order, cache)
+        keep = slice(start - lo, stop - lo)
+        processed = signal[keep]
+        yield ExportChunk(start, ts[keep], processed, quantizer.encode(processed))
+
+
+def pcm_bytes(codes, bits):
+    """Little-endian 16-bit WAV sample bytes for ``bits``-bit offset-binary codes.
+
+    Codes are left-justified into the two's complement sample word; codes
+    wider than 16 bits keep their top 16.
+    """
+    codes = np.asarray(codes, dtype=np.int64)
+    codes = codes << (16 - bits) if bits <= 16 else codes >> (bits - 16)
+    return (codes - (1 << 15)).astype('<i2').tobytes()
+
+
+def mat_double(name, rows, cols):
+    """MAT v5 header of a real double ``rows`` x ``cols`` variable.
+
+    The column-major float64 data follows it directly. Raises ValueError when
+    the variable would pass the format's 4 GiB element size.
+    """
+    name = name.encode("ascii")
+    nbytes = 8 * rows * cols
+    # Array flags (double class), dimensions, name, then the real part's tag
+    body = (np.array([6, 8, 6, 0, 5, 8, rows, cols, 1, len(name)], '<u4').tobytes()
+            + name + b"\0" * (-len(name) % 8) + np.array([9, nbytes], '<u4').tobytes())
+    if len(body) + nbytes >= 1 << 32:
+        raise ValueError("MAT files hold at most 4 GiB per variable; export NPY instead")
+    return np.array([14, len(body) + nbytes], '<u4').tobytes() + body
+
+
+def export_stream(filename, fmt, params, duration=None, chunk_size=DEFAULT_CHUNK,
+                  progress=None, cancelled=None, seed=0, cache=None):
+    """Write ``duration`` seconds of the processed signal to ``filename``.
+
+    ``progress(done, total)`` is called after every chunk and ``cancelled()``
+    polled before each one. Returns False, removing the partial file, if the
+    export was cancelled.
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format: {fmt}")
+    duration = params.duration if duration is None else duration
+    total = sample_count(params.fs, duration)
+    # Whole bytes per chunk for BIN
+    chunk_size = max(int(chunk_size) // 8 * 8, 8)
+    chunks = processed_chunks(params, duration, chunk_size, seed, cache)
+
+    def write_all(write):
+        for chunk in chunks:
+            if cancelled is not None and cancelled():
+                return False
+            write(chunk)
+            if progress is not None:
+                progress(chunk.start + chunk.processed.size, total)
+        return True
+
+    if fmt == "WAV":
+        with wave.open(filename, 'wb') as f:
+            f.setnchannels(1)
+            f.setsampwidth(2)
+            f.setframerate(int(round(params.fs)))
+            done = write_all(lambda c: f.writeframes(pcm_bytes(c.codes, params.bits)))
+    elif fmt == "CSV":
+        with open(filename, 'w') as f:
+            f.write("time,amplitude\n")
+            done = write_all(lambda c: np.savetxt(f, np.column_stack((c.ts, c.processed)),
+                                                  fmt='%.17g', delimiter=','))
+    elif fmt == "NPY":
+        out = np.lib.format.open_memmap(filename, mode='w+', dtype=np.float64, shape=(total,))
+
+        def write(c):
+            out[c.start:c.start + c.processed.size] = c.processed
+        done = write_all(write)
+        out.flush()
+        del out
+    elif fmt == "MAT":
+        # savemat has no append mode, so the file is laid out here: 'fs'
+        # first, then the row vector 'signal' as savemat would store it
+        header = (MAT_HEADER + mat_double("fs", 1, 1) + np.float64(params.fs).tobytes()
+                  + mat_double("signal", 1, total))
+        with open(filename, 'wb') as f:
+            f.write(header)
+            done = write_all(lambda c: f.write(c.processed.astype('<f8').tobytes()))
+    else:  # BIN: raw PCM bitstream, MSB first, packed eight bits per byte
+        with open(filename, 'wb') as f:
+            done = write_all(lambda c: pack_bits(unpack_codes(c.codes, params.bits)).tofile(f))
+
+    if not done and os.path.exists(filename):
+        os.remove(filename)
+    return done
@@ -0,0 +1,58 @@
+"""Vectorized line coding of PCM bitstreams.
+
+Bits come from the unpacked integer code stream (see ``bits``) and are expanded to
+``samples_per_bit`` waveform samples with NumPy only. Levels are small
+integers, so waveforms are returned as int8 to keep long streams compact.
+"""
+import numpy as np
+
+LINE_CODES = ("Unipolar", "Polar NRZ", "Bipolar RZ", "Manchester", "NRZ-I")
+
+
+def _alternating(bits):
+    # +1 after an odd running count of ones, -1 after an even one; the uint8
+    # cumsum wraps around but keeps the parity intact
+    parity = np.cumsum(bits, axis=-1, dtype=np.uint8) & 1
+    return (2 * parity - 1).view(np.int8)
+
+
+def _expand(levels, samples_per_bit):
+    return np.repeat(levels, samples_per_bit, axis=-1)
+
+
+def _expand_halves(first, second, samples_per_bit):
+    # Hold ``first`` for the first half of each bit period and ``second`` after
+    half = (samples_per_bit + 1) // 2
+    wave = np.empty(first.shape + (samples_per_bit,), dtype=np.int8)
+    wave[..., :half] = first[..., None]
+    wave[..., half:] = second[..., None]
+    return wave.reshape(*first.shape[:-1], -1)
+
+
+def line_code(bits, encoding, samples_per_bit=1):
+    bits = np.asarray(bits, dtype=np.uint8)
+    samples_per_bit = int(samples_per_bit)
+    if samples_per_bit < 1:
+        raise ValueError("samples_per_bit must be at least 1")
+
+    if encoding == "Unipolar":
+        return _expand(bits.view(np.int8), samples_per_bit)
+    elif encoding == "Polar NRZ":
+        return _expand((2 * bits - 1).view(np.int8), samples_per_bit)
+    elif encoding == "Bipolar RZ":
+        # AMI: marks alternate +1/-1, spaces are 0; each mark returns to zero
+        # halfway through its bit period
+        marks = _alternating(bits) * bits.view(np.int8)
+        if samples_per_bit == 1:
+            return marks
+        return _expand_halves(marks, np.zeros_like(marks), samples_per_bit)
+    elif encoding == "Manchester":
+        # IEEE 802.3: 0 is high-to-low, 1 is low-to-high
+        if samples_per_bit < 2:
+            raise ValueError("Manchester coding needs at least 2 samples per bit")
+        polar = (2 * bits - 1).view(np.int8)
+        return _expand_halves(-polar, polar, samples_per_bit)
+    elif encoding == "NRZ-I":
+        # Level toggles on every 1, starting from low
+        return _expand(_alternating(bits), samples_per_bit)
+    raise ValueError(f"Unknown line code: {encoding}")
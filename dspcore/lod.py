@@ -0,0 +1,60 @@
+"""Level-of-detail reduction of long series for plotting.
+
+A screen cannot show more than a couple of points per pixel column, so each
+series is cut down to the minimum and maximum of every column-sized bucket,
+which keeps peaks and the visual envelope exact. ``LODPyramid`` precomputes
+the reduction at every power-of-two level so a zoomed or panned view is
+answered by slicing the coarsest level that still has enough detail.
+"""
+import numpy as np
+
+
+def minmax_decimate(x, y, n_out):
+    """Reduce ``(x, y)`` to at most ``n_out`` points, keeping bucket extremes.
+
+    Every bucket contributes its minimum and maximum in their original order.
+    Series that already fit are returned unchanged.
+    """
+    x, y = np.asarray(x), np.asarray(y)
+    n = y.size
+    if n <= max(n_out, 2):
+        return x, y
+    size = -(-n // max(n_out // 2, 1))  # ceil
+    full = n // size
+    body = y[:full * size].reshape(full, size)
+    picks = np.column_stack((body.argmin(axis=1), body.argmax(axis=1)))
+    picks.sort(axis=1)
+    index = (picks + np.arange(0, full * size, size)[:, None]).ravel()
+    if full * size < n:
+        tail = y[full * size:]
+        index = np.concatenate((index, np.sort([tail.argmin(), tail.argmax()]) + full * size))
+    return x[index], y[index]
+
+
+class LODPyramid:
+    def __init__(self, x, y, min_points=512):
+        """Min/max pyramid of a series with ascending ``x``.
+
+        Level 0 is the raw data; each further level halves the point count
+        until it drops below ``min_points``.
+        """
+        x, y = np.asarray(x), np.asarray(y)
+        self.levels = [(x, y)]
+        while self.levels[-1][1].size > max(min_points, 4):
+            lx, ly = self.levels[-1]
+            self.levels.append(minmax_decimate(lx, ly, ly.size // 2))
+
+    def __len__(self):
+        return self.levels[0][1].size
+
+    def query(self, x0, x1, max_points):
+        """Points covering ``[x0, x1]``, at most about ``max_points`` of them.
+
+        One point beyond each end is kept so lines run off the view edges.
+        """
+        for lx, ly in self.levels:
+            i0 = max(int(np.searchsorted(lx, x0, side='left')) - 1, 0)
+            i1 = min(int(np.searchsorted(lx, x1, side='right')) + 1, lx.size)
+            if i1 - i0 <= max_points:
+                return lx[i0:i1], ly[i0:i1]
+        return minmax_decimate(lx[i0:i1], ly[i0:i1], max_points)
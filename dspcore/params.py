@@ -0,0 +1,33 @@
+"""Parsing of parameter value lists typed by users.
+
+Shared by the command-line tools and the GUIs, so it imports nothing but
+numpy.
+"""
+import numpy as np
+
+
+def parse_values(text, kind=float, limit=None):
+    """'1,2,5' -> [1, 2, 5]; 'start:stop:step' -> arange (stop inclusive).
+
+    Malformed input, including a zero step, raises ValueError. With
+    ``limit`` (e.g. a channel count), ranges are cut to [0, limit) before
+    they are expanded, so a typo like '0:1000000000' stays cheap.
+    """
+    values = []
+    for part in text.split(","):
+        if kind in (int, float) and ":" in part:
+            start, stop, step = (float(v) for v in (part.split(":") + ["1"])[:3])
+            if step == 0 or not np.isfinite([start, stop, step]).all():
+                raise ValueError(f"Invalid range: {part}")
+            if limit is not None:
+                if step > 0:
+                    # First value at or above 0, last below limit
+                    start += step * max(np.ceil(-start / step), 0)
+                    stop = min(stop, limit - 1)
+                else:
+                    start += step * max(np.ceil((start - limit + 1) / -step), 0)
+                    stop = max(stop, 0)
+            values.extend(kind(v) for v in np.arange(start, stop + step / 2, step))
+        else:
+            values.append(kind(part))
+    return values
@@ -0,0 +1,294 @@
+"""Headless signal chain shared by the Beginner, Intermediate and Expert apps.
+
+Nothing in here touches Qt: parameters come in as a plain ``DSPParams``
+record and every stage array comes back in a ``DSPResult``.
+"""
+from dataclasses import dataclass, fields, replace
+
+import numpy as np
+
+from .bits import bit_rate, unpack_codes
+from .design import default_cache
+from .linecode import LINE_CODES, line_code
+from .oscillator import synthesize
+from .profiling import Profiler
+from .reconstruct import reconstruct, reconstruction_error_db
+
+WAVEFORMS = ("Sine", "Square", "Triangle")
+WINDOWS = ("None", "Hamming", "Hanning", "Blackman")
+FILTERS = ("None", "Lowpass", "Highpass", "Bandpass")
+PCM_ENCODINGS = LINE_CODES
+
+
+@dataclass(frozen=True)
+class DSPParams:
+    freq: float = 10.0
+    amp: float = 1.0
+    fs: float = 100.0
+    bits: int = 8
+    quantizer: str = "Mid-tread"  # see quantizer.QUANTIZER_MODES
+    companding: str = "None"
+    phase: float = 0.0  # radians
+    waveform: str = "Sine"
+    bandlimited: bool = False  # PolyBLEP Square/Triangle for the sampled signal
+    window: str = "None"
+    filter: str = "None"
+    cutoff: float = 50.0
+    order: int = 4  # Butterworth order
+    pcm: str = "Unipolar"
+    samples_per_bit: int = 8  # line-code samples per PCM bit
+    noise: float = 0.0  # standard deviation of additive Gaussian noise
+    duration: float = 0.5
+    n_analog: int = 1000
+    channels: int = 1  # signal rows; see channel_phases
+
+
+# Fields that may differ between rows of one vectorized batch; every other
+# field changes array shapes or the stage code path, so batches are grouped on it.
+VECTOR_FIELDS = ("freq", "amp", "phase", "noise")
+GROUP_FIELDS = tuple(f.name for f in fields(DSPParams) if f.name not in VECTOR_FIELDS)
+
+
+@dataclass
+class DSPResult:
+    params: DSPParams
+    t: np.ndarray
+    ts: np.ndarray
+    analog: np.ndarray
+    sampled: np.ndarray
+    reconstructed: np.ndarray  # sampled, interpolated back onto ``t``
+    processed: np.ndarray
+    quantizer: object  # the Quantizer that produced ``codes``
+    codes: np.ndarray  # uint8/uint16 offset-binary codes
+    bit_matrix: np.ndarray  # (..., samples, bits) uint8, MSB first
+    bitstream: np.ndarray  # bit_matrix flattened per row
+    tb: np.ndarray
+    digital: np.ndarray
+    levels: object
+    nyquist: float
+    bit_rate: float
+    alias_freq: object
+    aliased: object
+    snr_db: object
+    sqnr_db: object  # measured on the processed signal
+    sqnr_theory_db: object
+    reconstruction_error_db: object  # reconstructed against analog
+    # Row positions in the original batch request (batch results only)
+    index: np.ndarray = None
+    # Samples produced since the stream started (streaming results only)
+    position: int = None
+
+    @property
+    def quantized(self):
+        # Reconstructed on demand; only the integer codes are kept
+        return self.quantizer.decode(self.codes)
+
+
+def channel_phases(params):
+    # Starting phase per channel, (channels, 1) for more than one: channel k
+    # lags channel 0 by k / channels of a cycle, like sensors spaced evenly
+    # around one rotating source
+    if params.channels == 1:
+        return params.phase
+    return params.phase - 2 * np.pi * np.arange(params.channels)[:, None] / params.channels
+
+
+def time_vectors(fs, duration=0.5, n_analog=1000):
+    t = np.linspace(0, duration, n_analog)
+    ts = np.arange(0, duration, 1/fs)
+    return t, ts
+
+
+def generate(t, freq, amp, phase=0.0, waveform="Sine"):
+    carrier = np.sin(2 * np.pi * freq * t + phase)
+    if waveform == "Sine":
+        return amp * carrier
+    elif waveform == "Square":
+        return amp * np.sign(carrier)
+    else:  # Triangle
+        return amp * (2/np.pi) * np.arcsin(carrier)
+
+
+def apply_window(signal, window_type, cache=None):
+    if window_type == "None":
+        return signal
+    cache = cache if cache is not None else default_cache
+    return signal * cache.window(window_type, signal.shape[-1])
+
+
+def apply_filter(signal, fs, filter_type, cutoff, order=4, cache=None):
+    if filter_type == "None":
+        return signal
+    import scipy.signal  # deferred: slow to import, and unused without a filter
+    cache = cache if cache is not None else default_cache
+    sos = cache.sos(filter_type, cutoff, fs, order)
+    # High orders on short buffers would otherwise exceed the default edge padding
+    padlen = min(3 * (2 * len(sos) + 1), signal.shape[-1] - 1)
+    return scipy.signal.sosfiltfilt(sos, signal, axis=-1, padlen=padlen)
+
+
+def encode_pcm(bitstream, encoding, samples_per_bit=8):
+    return line_code(bitstream, encoding, samples_per_bit)
+
+
+def alias_frequency(freq, fs):
+    return np.abs(freq - fs * np.round(freq/fs))
+
+
+def snr_db(clean, noisy):
+    signal_power = np.mean(clean**2, axis=-1)
+    noise_power = np.mean((noisy - clean)**2, axis=-1)
+    with np.errstate(divide='ignore'):
+        return 10 * np.log10(signal_power/noise_power)
+
+
+class DSPPipeline:
+    def __init__(self, rng=None, cache=None, profiler=None, results=None):
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self.cache = cache if cache is not None else default_cache
+        # Disabled unless the caller passes one it switches on
+        self.profiler = profiler if profiler is not None else Profiler()
+        # Optional ResultCache memoizing run(); None recomputes every time
+        self.results = results
+
+    def run(self, params):
+        # Noisy runs draw from the generator, so only noise-free ones repeat
+        if self.results is None or np.any(np.asarray(params.noise) > 0):
+            return self._run(params)
+        return self.results.get(params, lambda: self._run(params))
+
+    def process(self, params, signal):
+        """Run captured samples through the chain from the window stage on.
+
+        ``signal`` holds samples taken at ``params.fs``, either one vector or
+        (channels x samples); every channel goes through each stage in one
+        vectorized pass. The analog and sampled fields of the result hold the
+        input, and ``params.freq`` is only used for the aliasing report.
+        """
+        signal = np.asarray(signal, dtype=np.float64)
+        if signal.ndim not in (1, 2):
+            raise ValueError("Expected samples or (channels x samples)")
+        rows = signal.shape[0] if signal.ndim == 2 else None
+        ts = np.arange(signal.shape[-1]) / params.fs
+        snr = np.inf if rows is None else np.full(rows, np.inf)
+        return self._assemble(params, ts, ts, signal, signal, self._process(params, signal),
+                              snr, rows)
+
+    def run_batch(self, base=None, **columns):
+        """Process many configurations at once.
+
+        Keyword arguments name ``DSPParams`` fields and hold arrays that are
+        broadcast against each other; fields not given come from ``base``.
+        Rows sharing ``GROUP_FIELDS`` are computed as one 2-D pass and returned
+        as one ``DSPResult`` whose ``index`` maps its rows back to the request.
+        """
+        base = base if base is not None else DSPParams()
+        unknown = set(columns) - {f.name for f in fields(DSPParams)}
+        if unknown:
+            raise TypeError(f"Unknown parameter(s): {', '.join(sorted(unknown))}")
+        if not columns:
+            return [self._run(base)]
+
+        names = list(columns)
+        arrays = [a.ravel() for a in np.broadcast_arrays(*[np.asarray(columns[n]) for n in names])]
+        columns = dict(zip(names, arrays))
+        rows = arrays[0].size
+
+        grouped = [n for n in names if n in GROUP_FIELDS]
+        if grouped:
+            keys = np.stack([np.unique(columns[n], return_inverse=True)[1] for n in grouped],
+                            axis=1)
+            _, group_ids = np.unique(keys, axis=0, return_inverse=True)
+            group_ids = group_ids.ravel()
+        else:
+            group_ids = np.zeros(rows, dtype=int)
+
+        results = []
+        for group in np.unique(group_ids):
+            index = np.flatnonzero(group_ids == group)
+            overrides = {n: columns[n][index[0]].item() for n in grouped}
+            overrides.update({n: columns[n][index][:, None] for n in names if n in VECTOR_FIELDS})
+            result = self._run(replace(base, **overrides), rows=index.size)
+            result.index = index
+            results.append(result)
+        return results
+
+    def _run(self, params, rows=None):
+        stage = self.profiler.stage
+        t, ts = time_vectors(params.fs, params.duration, params.n_analog)
+        phase = channel_phases(params)
+        if params.channels > 1:
+            if rows is not None:
+                raise ValueError("Multi-channel parameters cannot be batched")
+            rows = params.channels
+
+        with stage("generate"):
+            analog_signal = generate(t, params.freq, params.amp, phase, params.waveform)
+            if params.bandlimited:
+                sampled_signal = synthesize(ts.size, params.fs, params.freq, params.amp,
+                                            phase, params.waveform)
+            else:
+                sampled_signal = generate(ts, params.freq, params.amp, phase, params.waveform)
+        if rows is not None:
+            shape = (rows, ts.size)
+            analog_signal = np.broadcast_to(analog_signal, (rows, t.size))
+            sampled_signal = np.broadcast_to(sampled_signal, shape)
+
+        if np.any(np.asarray(params.noise) > 0):
+            with stage("noise"):
+                noise = self.rng.normal(0, 1, sampled_signal.shape)
+                noisy_signal = sampled_signal + noise * params.noise
+                snr = snr_db(sampled_signal, noisy_signal)
+        else:
+            noisy_signal = sampled_signal
+            snr = np.inf if rows is None else np.full(rows, np.inf)
+
+        return self._assemble(params, t, ts, analog_signal, sampled_signal,
+                              self._process(params, noisy_signal), snr, rows)
+
+    def _process(self, params, signal):
+        # Window and filter along the last axis, for any number of rows
+        with self.profiler.stage("window"):
+            signal = apply_window(signal, params.window, self.cache)
+        with self.profiler.stage("filter"):
+            return apply_filter(signal, params.fs, params.filter, params.cutoff,
+                                params.order, self.cache)
+
+    def _assemble(self, params, t, ts, analog_signal, sampled_signal, processed_signal,
+                  snr, rows=None):
+        # Reconstruction and quantizer onwards, shared with the streaming pipeline
+        stage = self.profiler.stage
+        with stage("reconstruct"):
+            # Grid positions in samples: t is uniform and starts at 0
+            ratio = t[1] * params.fs if t.size > 1 else 0.0
+            kernel = self.cache.reconstruction(ratio, t.size, ts.size)
+            reconstructed = reconstruct(sampled_signal, kernel)
+            reconstruction_error = reconstruction_error_db(analog_signal, reconstructed, kernel)
+
+        quantizer = self.cache.quantizer(params.bits, params.quantizer, params.companding)
+        with stage("quantize"):
+            codes = quantizer.encode(processed_signal)
+        with stage("pcm"):
+            bit_matrix = unpack_codes(codes, params.bits)
+            bitstream = bit_matrix.reshape(*bit_matrix.shape[:-2], -1)
+            digital_signal = encode_pcm(bitstream, params.pcm, params.samples_per_bit)
+        # Bit-clock time axis: fs * bits bits per second, samples_per_bit each
+        bit_clock = params.fs * params.bits * params.samples_per_bit
+        tb = np.arange(digital_signal.shape[-1]) / bit_clock
+
+        with stage("sqnr"):
+            sqnr = snr_db(processed_signal, quantizer.decode(codes))
+            sqnr_theory = quantizer.sqnr_theory_db(np.mean(processed_signal ** 2, axis=-1))
+
+        nyquist = params.fs / 2
+        levels = np.power(2, params.bits)
+        alias_freq = alias_frequency(params.freq, params.fs)
+        aliased = np.asarray(params.freq) > nyquist
+        if rows is not None:
+            levels, alias_freq, aliased = (np.broadcast_to(v, (rows, 1)).ravel()
+                                           for v in (levels, alias_freq, aliased))
+
+        return DSPResult(params, t, ts, analog_signal, sampled_signal, reconstructed,
+                         processed_signal, quantizer, codes, bit_matrix, bitstream, tb,
+                         digital_signal, levels, nyquist, bit_rate(bitstream, ts.size, params.fs),
+                         alias_freq, aliased, snr, sqnr, sqnr_theory, reconstruction_error)
@@ -0,0 +1,164 @@
+"""Optional per-stage timing and memory telemetry for the signal chain.
+
+A disabled ``Profiler`` hands out one shared no-op context manager, so the
+instrumented code pays a method call per stage and nothing else. Enabled, it
+times each stage with ``perf_counter``, keeps rolling windows of stage and
+frame times and keeps trace events for ``dump()``, which writes the Chrome
+trace format read by chrome://tracing and Perfetto. Peak memory per frame
+(numpy array buffers are visible to ``tracemalloc``) is a separate opt-in:
+tracing every allocation slows the stages being timed several times over.
+"""
+import contextlib
+import json
+import os
+import threading
+import time
+import tracemalloc
+from collections import deque
+
+import numpy as np
+
+_DISABLED = contextlib.nullcontext()
+
+
+class _Stage:
+    __slots__ = ("profiler", "name", "start")
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler.record(self.name, self.start, time.perf_counter())
+
+
+class Profiler:
+    def __init__(self, history=240, max_events=100000):
+        """Rolling statistics over the last ``history`` samples of each stage.
+
+        Stages may be timed from any thread; at most ``max_events`` trace
+        events are kept, oldest dropped first.
+        """
+        self.enabled = False
+        self.trace_memory = False
+        self.history = int(history)
+        self._lock = threading.Lock()
+        self._events = deque(maxlen=int(max_events))
+        self._owns_tracing = False
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.stages = {}  # stage name -> recent durations in ms
+            self.frame_times = deque(maxlen=self.history)
+            self.frame_peaks = deque(maxlen=self.history)
+            self.shown = deque(maxlen=self.history)  # times frames reached the screen
+            self.peak_bytes = 0
+            self._frame_start = None
+            self._events.clear()
+        self._origin = time.perf_counter()
+
+    def set_enabled(self, enabled):
+        if enabled == self.enabled:
+            return
+        if enabled:
+            self.reset()
+        self.enabled = enabled
+        self._update_tracing()
+
+    def set_memory_tracing(self, enabled):
+        """Track peak memory per frame while profiling (slows every stage)."""
+        self.trace_memory = enabled
+        self._update_tracing()
+
+    def _update_tracing(self):
+        wanted = self.enabled and self.trace_memory
+        if wanted and not self._owns_tracing:
+            # Leave tracing alone if someone else already started it
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._owns_tracing = True
+        elif not wanted and self._owns_tracing:
+            tracemalloc.stop()
+            self._owns_tracing = False
+
+    def stage(self, name):
+        """Context manager timing one stage; free when disabled."""
+        return _Stage(self, name) if self.enabled else _DISABLED
+
+    def record(self, name, start, end):
+        with self._lock:
+            times = self.stages.get(name)
+            if times is None:
+                times = self.stages[name] = deque(maxlen=self.history)
+            times.append((end - start) * 1e3)
+            self._events.append((name, start, end, threading.get_ident()))
+
+    def begin_frame(self):
+        # A frame runs from the request to the moment it is on screen
+        if self.enabled:
+            self._frame_start = time.perf_counter()
+
+    def end_frame(self):
+        if not self.enabled or self._frame_start is None:
+            return
+        now = time.perf_counter()
+        peak = 0
+        if self.trace_memory and tracemalloc.is_tracing():
+            peak = tracemalloc.get_traced_memory()[1]
+            if hasattr(tracemalloc, "reset_peak"):  # Python 3.9+
+                tracemalloc.reset_peak()
+        with self._lock:
+            self.frame_times.append((now - self._frame_start) * 1e3)
+            self.frame_peaks.append(peak)
+            self.shown.append(now)
+            self.peak_bytes = max(self.peak_bytes, peak)
+            self._events.append(("frame", self._frame_start, now, threading.get_ident()))
+        self._frame_start = None
+
+    def histogram(self, bins=8):
+        """Counts and edges (ms) of the recent frame times."""
+        with self._lock:
+            times = np.array(self.frame_times)
+        if times.size == 0:
+            return np.zeros(bins, dtype=int), np.zeros(bins + 1)
+        return np.histogram(times, bins=bins)
+
+    def summary(self):
+        with self._lock:
+            stages = {name: np.array(times) for name, times in self.stages.items()}
+            frames = np.array(self.frame_times)
+            shown = list(self.shown)
+            peaks = np.array(self.frame_peaks)
+            peak_bytes = self.peak_bytes
+        frame = {}
+        if frames.size:
+            p50, p95 = np.percentile(frames, [50, 95])
+            frame = {"count": int(frames.size), "p50_ms": float(p50), "p95_ms": float(p95),
+                     "max_ms": float(frames.max()),
+                     "fps": (len(shown) - 1) / (shown[-1] - shown[0]) if len(shown) > 1 else 0.0}
+        return {
+            "stages": {name: {"count": int(t.size), "last_ms": float(t[-1]),
+                              "mean_ms": float(t.mean()), "max_ms": float(t.max())}
+                       for name, t in stages.items() if t.size},
+            "frame": frame,
+            "frame_peak_bytes": int(peaks[-1]) if peaks.size else 0,
+            "peak_bytes": int(peak_bytes),
+        }
+
+    def dump(self, filename):
+        """Write the kept events and a summary as a Chrome trace JSON file."""
+        with self._lock:
+            events = list(self._events)
+        pid = os.getpid()
+        trace = [{"name": name, "ph": "X", "pid": pid, "tid": tid,
+                  "ts": (start - self._origin) * 1e6, "dur": (end - start) * 1e6}
+                 for name, start, end, tid in events]
+        with open(filename, "w") as f:
+            json.dump({"traceEvents": trace, "displayTimeUnit": "ms",
+                       "summary": self.summary()}, f)
+        return len(trace)
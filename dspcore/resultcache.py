@@ -0,0 +1,101 @@
+"""Byte-budgeted LRU cache of whole pipeline results.
+
+Scrubbing a control back and forth, or an animation that cycles through the
+same phases, keeps asking for parameter sets that were computed moments
+ago. Results are keyed by the frozen ``DSPParams`` (or any hashable key the
+caller builds around them) and charged for the numpy arrays they hold;
+least recently used entries are dropped once the total passes ``max_bytes``.
+Cached results are shared and must be treated as read-only.
+"""
+import dataclasses
+import threading
+from collections import OrderedDict, namedtuple
+
+import numpy as np
+
+ResultCacheInfo = namedtuple("ResultCacheInfo",
+                             ["hits", "misses", "evictions", "maxbytes", "currbytes", "currsize"])
+
+
+def result_nbytes(value):
+    # Bytes of array data held by a result, tuple, list or dict of them.
+    # Broadcast views are charged for the memory they actually reference.
+    if isinstance(value, np.ndarray):
+        if value.base is not None and 0 in value.strides:
+            return result_nbytes(value.base)
+        return value.nbytes
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return sum(result_nbytes(getattr(value, f.name)) for f in dataclasses.fields(value))
+    if isinstance(value, (tuple, list)):
+        return sum(result_nbytes(v) for v in value)
+    if isinstance(value, dict):
+        return sum(result_nbytes(v) for v in value.values())
+    return 0
+
+
+class ResultCache:
+    def __init__(self, max_bytes=64 << 20):
+        """At most ``max_bytes`` of array data; larger single results are not kept."""
+        self.max_bytes = int(max_bytes)
+        self._entries = OrderedDict()  # key -> (value, nbytes)
+        self._lock = threading.Lock()
+        self.currbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, compute):
+        """The cached value for ``key``, or ``compute()`` stored under it."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self.hits += 1
+                self._entries.move_to_end(key)
+                return entry[0]
+            self.misses += 1
+        # Computed outside the lock so readers of the statistics never wait
+        # on a pipeline run
+        value = compute()
+        self.put(key, value)
+        return value
+
+    def put(self, key, value):
+        nbytes = result_nbytes(value)
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.currbytes -= old[1]
+            if nbytes > self.max_bytes:
+                return
+            self._entries[key] = (value, nbytes)
+            self.currbytes += nbytes
+            self._evict()
+
+    def _evict(self):
+        while self.currbytes > self.max_bytes and self._entries:
+            _, (_, nbytes) = self._entries.popitem(last=False)
+            self.currbytes -= nbytes
+            self.evictions += 1
+
+    def resize(self, max_bytes):
+        with self._lock:
+            self.max_bytes = int(max_bytes)
+            self._evict()
+
+    @property
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def cache_info(self):
+        with self._lock:
+            return ResultCacheInfo(self.hits, self.misses, self.evictions, self.max_bytes,
+                                   self.currbytes, len(self._entries))
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.currbytes = 0
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
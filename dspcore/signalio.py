@@ -0,0 +1,87 @@
+"""Memory-mapped signal files and tone parameter estimation.
+
+Signals are opened as read-only memory maps, so opening a capture costs the
+same whatever its size; estimation only reads one bounded segment from the
+start of the file.
+"""
+from dataclasses import dataclass
+
+import numpy as np
+
+SIGNAL_FILE_TYPES = ("npy", "wav")
+
+
+@dataclass
+class ToneEstimate:
+    freq: float
+    amp: float  # peak amplitude of the given waveform
+    phase: float  # radians, referenced to the first sample
+    offset: float  # DC level
+
+
+def open_signal(filename):
+    """Memory-map a .npy or .wav file; returns ``(samples, fs)``.
+
+    ``fs`` is None for .npy files, which carry no sample rate. Multi-channel
+    data is reduced to its first channel as a strided view. 24-bit WAV
+    samples cannot be mapped and are read into memory instead.
+    """
+    if filename.lower().endswith(".wav"):
+        import scipy.io.wavfile
+        try:
+            fs, data = scipy.io.wavfile.read(filename, mmap=True)
+        except ValueError:
+            # 3-byte containers have no numpy dtype to map; a malformed file
+            # fails again here with its own error
+            fs, data = scipy.io.wavfile.read(filename)
+        # WAV frames are (samples, channels)
+        return (data[:, 0] if data.ndim > 1 else data), fs
+    data = np.load(filename, mmap_mode='r')
+    # 2-D arrays are taken as channels x samples
+    return (data.reshape(-1, data.shape[-1])[0] if data.ndim > 1 else data), None
+
+
+def to_float(samples):
+    # Integer PCM scaled to [-1, 1); 8-bit WAV is unsigned
+    samples = np.asarray(samples)
+    if samples.dtype == np.uint8:
+        return (samples.astype(np.float64) - 128) / 128
+    if np.issubdtype(samples.dtype, np.integer):
+        return samples.astype(np.float64) / -float(np.iinfo(samples.dtype).min)
+    return samples.astype(np.float64)
+
+
+def estimate_tone(samples, fs, waveform="Sine", max_points=1 << 16):
+    """Estimate frequency, amplitude and phase of the dominant tone.
+
+    Only the first ``max_points`` samples are read. The frequency comes from
+    the Hann-windowed spectrum peak refined by Gaussian interpolation over its
+    neighbouring bins; amplitude and phase from a least-squares sine fit at
+    that frequency, scaled from the fundamental to the waveform's peak.
+    """
+    x = to_float(samples[:max_points])
+    n = x.size
+    if n < 4:
+        raise ValueError("Need at least 4 samples to estimate a tone")
+
+    import scipy.fft
+    spectrum = np.abs(scipy.fft.rfft((x - x.mean()) * np.hanning(n)))
+    k = int(np.argmax(spectrum[1:-1])) + 1
+    a, b, c = np.log(spectrum[k - 1:k + 2] + np.finfo(float).tiny)
+    denom = a - 2 * b + c
+    delta = 0.5 * (a - c) / denom if denom < 0 else 0.0
+    freq = (k + delta) * fs / n
+
+    t = np.arange(n) / fs
+    basis = np.column_stack((np.sin(2 * np.pi * freq * t),
+                             np.cos(2 * np.pi * freq * t), np.ones(n)))
+    (s, co, offset), *_ = np.linalg.lstsq(basis, x, rcond=None)
+    fundamental = np.hypot(s, co)
+    if waveform == "Square":
+        amp = fundamental * np.pi / 4
+    elif waveform == "Triangle":
+        amp = fundamental * np.pi ** 2 / 8
+    else:
+        amp = fundamental
+    return ToneEstimate(float(freq), float(amp), float(np.arctan2(co, s) % (2 * np.pi)),
+                        float(offset))
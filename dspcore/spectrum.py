@@ -0,0 +1,51 @@
+"""One real FFT per signal, shared by every spectrum view.
+
+``rfft_spectrum`` windows the signal, zero-pads it to a fast FFT length and
+runs a single ``scipy.fft.rfft``; magnitude and phase are both derived from
+that one transform, and frequency axes come from the design cache.
+"""
+from dataclasses import dataclass
+
+import numpy as np
+
+from .design import default_cache
+
+# Passed to scipy.fft; -1 uses every core for batched (2-D) transforms
+FFT_WORKERS = -1
+
+
+@dataclass
+class Spectrum:
+    freqs: np.ndarray
+    values: np.ndarray  # complex one-sided FFT of the windowed signal
+    scale: float  # 1 / window sum: sinusoid peaks read as their amplitude
+
+    @property
+    def magnitude(self):
+        return np.abs(self.values) * self.scale
+
+    @property
+    def phase(self):
+        return np.unwrap(np.angle(self.values), axis=-1)
+
+
+def rfft_spectrum(signal, fs, window="Hanning", pad=True, workers=FFT_WORKERS, cache=None):
+    """Windowed one-sided spectrum of ``signal`` along its last axis.
+
+    ``window`` takes the names offered for the window stage; the default
+    matches matplotlib's magnitude_spectrum/phase_spectrum. With ``pad`` the
+    transform length is rounded up with ``next_fast_len``.
+    """
+    import scipy.fft  # deferred until the first spectrum is asked for
+    cache = cache if cache is not None else default_cache
+    signal = np.asarray(signal)
+    n = signal.shape[-1]
+    if window == "None":
+        scale = 1.0 / n if n else 1.0
+    else:
+        w = cache.window(window, n)
+        signal = signal * w
+        scale = 1.0 / w.sum()
+    nfft = scipy.fft.next_fast_len(n, real=True) if pad and n else n
+    values = scipy.fft.rfft(signal, n=nfft, axis=-1, workers=workers)
+    return Spectrum(cache.rfft_freqs(nfft, fs), values, scale)
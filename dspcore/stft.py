@@ -0,0 +1,95 @@
+"""Incremental short-time Fourier transform with a rolling spectrogram.
+
+Samples are pushed as they arrive; only the segments completed by the new
+samples are transformed (one batched rfft per push), their power spectra are
+written into a fixed-size ring of image columns in place, and a running
+Welch estimate accumulates the mean of every segment seen since the last
+reset.
+"""
+import numpy as np
+
+from .design import default_cache
+from .spectrum import FFT_WORKERS
+
+
+def segment_length(fs, seconds=0.1, lo=16, hi=1024):
+    # Power-of-two segment covering about ``seconds`` of signal
+    n = 1 << max(int(np.ceil(np.log2(max(fs * seconds, 1)))), 0)
+    return int(min(max(n, lo), hi))
+
+
+class IncrementalSTFT:
+    def __init__(self, fs, nperseg=256, hop=None, window="Hanning", history=256, cache=None):
+        """Spectrogram of the last ``history`` segments, ``hop`` samples apart.
+
+        ``window`` takes the names offered for the window stage. Power is
+        scaled as a one-sided density (units^2 / Hz), as in ``scipy.signal.welch``.
+        """
+        cache = cache if cache is not None else default_cache
+        self.fs = float(fs)
+        self.nperseg = int(nperseg)
+        self.hop = int(hop) if hop else max(self.nperseg // 4, 1)
+        self.window_type = window
+        self.window = (np.ones(self.nperseg) if window == "None"
+                       else cache.window(window, self.nperseg))
+        self.freqs = cache.rfft_freqs(self.nperseg, fs)
+        self.scale = np.full(self.freqs.size, 2.0 / (self.fs * np.sum(self.window ** 2)))
+        self.scale[0] /= 2
+        if self.nperseg % 2 == 0:
+            self.scale[-1] /= 2
+
+        self.image = np.zeros((self.freqs.size, int(history)))
+        self.columns = 0  # segments transformed since construction
+        self.restart()
+
+    def restart(self, keep_psd=False):
+        """Start a new, unrelated signal: drop buffered samples and the PSD.
+
+        The spectrogram keeps its history, so the change shows up in it.
+        ``keep_psd`` keeps averaging, for independent records of one signal.
+        """
+        self._pending = np.zeros(0)
+        if not keep_psd:
+            self._psd_sum = np.zeros(self.freqs.size)
+            self.averaged = 0
+
+    def push(self, samples):
+        """Add samples; returns the number of new segments transformed."""
+        import scipy.fft
+        data = np.concatenate((self._pending, np.asarray(samples, dtype=np.float64)))
+        count = (data.size - self.nperseg) // self.hop + 1 if data.size >= self.nperseg else 0
+        if count == 0:
+            self._pending = data
+            return 0
+        segments = np.lib.stride_tricks.sliding_window_view(data, self.nperseg)[::self.hop][:count]
+        spectra = scipy.fft.rfft(segments * self.window, axis=-1, workers=FFT_WORKERS)
+        power = (spectra.real ** 2 + spectra.imag ** 2) * self.scale
+        self._pending = data[count * self.hop:]
+
+        self._psd_sum += power.sum(axis=0)
+        self.averaged += count
+
+        # Ring of image columns, written in place; only the last ``history``
+        # segments of a long push can survive
+        history = self.image.shape[1]
+        keep = power[-history:]
+        cols = (self.columns + count - keep.shape[0] + np.arange(keep.shape[0])) % history
+        self.image[:, cols] = keep.T
+        self.columns += count
+        return count
+
+    def spectrogram(self):
+        # Columns oldest to newest; unfilled columns stay zero on the left
+        head = self.columns % self.image.shape[1]
+        if self.columns < self.image.shape[1]:
+            return np.roll(self.image, self.image.shape[1] - head, axis=1)
+        return np.concatenate((self.image[:, head:], self.image[:, :head]), axis=1)
+
+    def psd(self):
+        # Running Welch estimate: mean power of every segment since restart()
+        return self._psd_sum / self.averaged if self.averaged else self._psd_sum.copy()
+
+    def times(self):
+        # Time of each spectrogram column relative to the newest segment
+        history = self.image.shape[1]
+        return (np.arange(history) - (history - 1)) * self.hop / self.fs
@@ -0,0 +1,145 @@
+"""Causal block-streaming version of the signal chain.
+
+``DSPPipeline`` regenerates and zero-phase filters the whole frame on every
+call. ``StreamingPipeline`` instead keeps the newest frame of samples in
+ring buffers and only synthesizes and filters the samples that are new since
+the last call, carrying the SOS filter state between blocks, so the cost of
+a frame is proportional to how far the stream has advanced.
+"""
+import numpy as np
+
+from .oscillator import Oscillator
+from .pipeline import DSPPipeline, channel_phases, generate, snr_db, time_vectors
+
+
+class RingBuffer:
+    def __init__(self, capacity, dtype=np.float64, channels=None):
+        # ``channels`` rows share one write position; None keeps it 1-D
+        capacity = max(int(capacity), 1)
+        shape = (capacity,) if channels is None else (int(channels), capacity)
+        self.data = np.zeros(shape, dtype=dtype)
+        self.head = 0  # next write position
+        self.size = 0
+
+    @property
+    def capacity(self):
+        return self.data.shape[-1]
+
+    def __len__(self):
+        return self.size
+
+    def extend(self, values):
+        values = np.asarray(values)[..., -self.capacity:]
+        n = values.shape[-1]
+        first = min(n, self.capacity - self.head)
+        self.data[..., self.head:self.head + first] = values[..., :first]
+        self.data[..., :n - first] = values[..., first:]
+        self.head = (self.head + n) % self.capacity
+        self.size = min(self.size + n, self.capacity)
+
+    def view(self):
+        # Oldest to newest, as a new array
+        if self.size < self.capacity:
+            return self.data[..., :self.size].copy()
+        return np.concatenate((self.data[..., self.head:], self.data[..., :self.head]), axis=-1)
+
+
+class StreamingFilter:
+    def __init__(self, sos, zi):
+        """Butterworth SOS run block by block with ``scipy.signal.sosfilt``.
+
+        ``zi`` is the unit-step steady state; it is scaled by the first sample
+        so the stream starts without a transient. Blocks may be (channels x
+        samples), filtered along the last axis.
+        """
+        self.sos = sos
+        self.zi_step = zi
+        self.state = None
+
+    def reset(self):
+        self.state = None
+
+    def process(self, block):
+        import scipy.signal
+        if block.size == 0:
+            return block
+        if self.state is None:
+            # (sections, ..., 2): one state per channel
+            zi = self.zi_step.reshape(self.zi_step.shape[0], *[1] * (block.ndim - 1), 2)
+            self.state = zi * block[..., 0][..., None]
+        out, self.state = scipy.signal.sosfilt(self.sos, block, axis=-1, zi=self.state)
+        return out
+
+
+class StreamingPipeline(DSPPipeline):
+    def __init__(self, block_size=256, rng=None, cache=None, profiler=None):
+        super().__init__(rng, cache, profiler)
+        self.block_size = int(block_size)
+        self.params = None
+
+    def reset(self, params):
+        _, ts = time_vectors(params.fs, params.duration, params.n_analog)
+        self.params = params
+        self.position = 0  # samples produced since the reset
+        # The phase accumulator carries the waveform across blocks
+        self.oscillator = Oscillator(params.freq, params.fs, params.amp, channel_phases(params),
+                                     params.waveform, params.bandlimited)
+        channels = params.channels if params.channels > 1 else None
+        self.block = np.empty(self.block_size if channels is None else (channels, self.block_size))
+        self.sampled = RingBuffer(ts.size, channels=channels)
+        self.noisy = RingBuffer(ts.size, channels=channels)
+        self.processed = RingBuffer(ts.size, channels=channels)
+        self.filter = None
+        if params.filter != "None":
+            args = (params.filter, params.cutoff, params.fs, params.order)
+            self.filter = StreamingFilter(self.cache.sos(*args), self.cache.zi(*args))
+
+    def run(self, params, advance=0):
+        """Advance the stream by ``advance`` samples and return the newest frame.
+
+        A change of parameters restarts the stream and fills one whole frame.
+        Times in the result are relative to the oldest sample in the frame.
+        The window stage is skipped: it is only defined over a whole frame.
+        """
+        if params != self.params:
+            self.reset(params)
+            advance = self.sampled.capacity
+        for start in range(0, int(advance), self.block_size):
+            self._process_block(min(self.block_size, int(advance) - start))
+        return self._frame()
+
+    def _process_block(self, n):
+        params, stage = self.params, self.profiler.stage
+        with stage("generate"):
+            sampled = self.oscillator.render(self.block[..., :n])
+        self.position += n
+
+        noisy = sampled
+        if params.noise > 0:
+            with stage("noise"):
+                noisy = sampled + self.rng.normal(0, 1, sampled.shape) * params.noise
+        with stage("filter"):
+            processed = self.filter.process(noisy) if self.filter is not None else noisy
+
+        self.sampled.extend(sampled)
+        self.noisy.extend(noisy)
+        self.processed.extend(processed)
+
+    def _frame(self):
+        params = self.params
+        sampled, noisy = self.sampled.view(), self.noisy.view()
+        n = sampled.shape[-1]
+        ts = np.arange(n) / params.fs
+        t = np.linspace(0, params.duration, params.n_analog)
+        # Phase of the oldest sample in the frame
+        phase = 2 * np.pi * (self.oscillator.cycles - params.freq * n / params.fs)
+        with self.profiler.stage("generate"):
+            analog = generate(t, params.freq, params.amp, phase, params.waveform)
+        rows = params.channels if params.channels > 1 else None
+        if params.noise > 0:
+            snr = snr_db(sampled, noisy)
+        else:
+            snr = np.inf if rows is None else np.full(rows, np.inf)
+        result = self._assemble(params, t, ts, analog, sampled, self.processed.view(), snr, rows)
+        result.position = self.position
+        return result
@@ -0,0 +1,176 @@
+"""Headless parameter sweeps over the signal chain.
+
+Every combination of the given parameter values is run through
+``DSPPipeline.run_batch``. Combinations that only differ in frequency,
+amplitude or noise share one vectorized batch; the batches are spread over
+a process pool. Results come back as one table of per-configuration metrics.
+
+Run ``python -m dspcore.sweep --help`` for the command line.
+"""
+import argparse
+import csv
+import itertools
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import fields, replace
+
+import numpy as np
+
+from .params import parse_values
+from .pipeline import FILTERS, PCM_ENCODINGS, VECTOR_FIELDS, WINDOWS, DSPParams, DSPPipeline
+from .quantizer import COMPANDING, QUANTIZER_MODES
+
+# Grid axes the command line exposes, in output column order
+SWEEP_FIELDS = ("freq", "amp", "fs", "bits", "quantizer", "companding", "noise", "window",
+                "filter", "cutoff", "order", "pcm")
+METRICS = ("alias_freq", "aliased", "levels", "sqnr_db", "sqnr_theory_db", "snr_db",
+           "reconstruction_error_db", "bit_rate", "line_dc")
+
+
+def metrics(result):
+    """Per-row metrics of a (batch) ``DSPResult`` as a dict of 1-D arrays."""
+    rows = np.atleast_2d(result.processed).shape[0]
+
+    def column(value):
+        # Scalars (single runs, group-wide values) repeat over the rows
+        return np.broadcast_to(np.ravel(value).astype(float), (rows,)).copy()
+
+    return {
+        "alias_freq": column(result.alias_freq),
+        "aliased": column(result.aliased),
+        "levels": column(result.levels),
+        "sqnr_db": column(result.sqnr_db),
+        "sqnr_theory_db": column(result.sqnr_theory_db),
+        "snr_db": column(result.snr_db),
+        "reconstruction_error_db": column(result.reconstruction_error_db),
+        "bit_rate": column(result.bit_rate),
+        "line_dc": np.atleast_2d(result.digital).mean(axis=-1),
+    }
+
+
+def _run_group(base, vectors, seed):
+    # One batch in a worker process; returns the group's metric columns
+    pipeline = DSPPipeline(rng=np.random.default_rng(seed))
+    try:
+        results = pipeline.run_batch(base, **vectors)
+    except ValueError:
+        # e.g. a filter cutoff at or above Nyquist: no result for this group
+        rows = len(next(iter(vectors.values()))) if vectors else 1
+        return {name: np.full(rows, np.nan) for name in METRICS}
+    columns = {}
+    for result in results:
+        for name, values in metrics(result).items():
+            columns.setdefault(name, []).append(values)
+    return {name: np.concatenate(parts) for name, parts in columns.items()}
+
+
+def sweep(grid, base=None, processes=None, seed=0):
+    """Run every combination of ``grid`` (field name -> list of values).
+
+    Fields not in ``grid`` come from ``base``. ``processes=0`` runs in this
+    process. Returns a dict of equal-length columns: the swept parameters
+    followed by ``METRICS``.
+    """
+    base = base if base is not None else DSPParams()
+    valid = {f.name for f in fields(DSPParams)}
+    unknown = set(grid) - valid
+    if unknown:
+        raise TypeError(f"Unknown parameter(s): {', '.join(sorted(unknown))}")
+    grid = {name: list(values) for name, values in grid.items()}
+
+    # Fields that change the code path or array shapes define the groups;
+    # vector fields are crossed inside each group's batch
+    group_names = [n for n in grid if n not in VECTOR_FIELDS]
+    vector_names = [n for n in grid if n in VECTOR_FIELDS]
+    vector_rows = []
+    if vector_names:
+        vector_rows = [np.asarray(v)
+                       for v in zip(*itertools.product(*(grid[n] for n in vector_names)))]
+    groups = list(itertools.product(*(grid[n] for n in group_names)))
+    seeds = np.random.SeedSequence(seed).spawn(len(groups))
+
+    tasks = []
+    for values, child in zip(groups, seeds):
+        tasks.append((replace(base, **dict(zip(group_names, values))),
+                      dict(zip(vector_names, vector_rows)), child))
+
+    if processes == 0 or len(tasks) == 1:
+        outputs = [_run_group(*task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=processes) as pool:
+            outputs = list(pool.map(_run_group, *zip(*tasks)))
+
+    per_group = len(vector_rows[0]) if vector_rows else 1
+    table = {}
+    for i, name in enumerate(group_names):
+        table[name] = np.repeat(np.asarray([g[i] for g in groups]), per_group)
+    for name, values in zip(vector_names, vector_rows):
+        table[name] = np.tile(values, len(groups))
+    for name in METRICS:
+        table[name] = np.concatenate([out[name] for out in outputs])
+    return table
+
+
+def write_table(table, filename):
+    if filename.lower().endswith(".npz"):
+        np.savez(filename, **table)
+        return
+    names = list(table)
+    with open(filename, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(names)
+        writer.writerows(zip(*(table[n].tolist() for n in names)))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m dspcore.sweep",
+        description="Sweep DSP chain parameters and tabulate alias frequency, SQNR, SNR "
+                    "and bit rate.")
+    parser.add_argument("-o", "--output", default="sweep.csv", help="output table (.csv or .npz)")
+    parser.add_argument("--freq", default="10", help="signal frequencies in Hz, e.g. 1:1000:1")
+    parser.add_argument("--amp", default="1")
+    parser.add_argument("--fs", default="100", help="sampling rates in Hz, e.g. 100,200,500")
+    parser.add_argument("--bits", default="8", help="quantizer bits, e.g. 1:16")
+    parser.add_argument("--quantizer", default="Mid-tread",
+                        help=f"any of {','.join(QUANTIZER_MODES)}")
+    parser.add_argument("--companding", default="None", help=f"any of {','.join(COMPANDING)}")
+    parser.add_argument("--noise", default="0", help="noise standard deviations")
+    parser.add_argument("--window", default="None", help=f"any of {','.join(WINDOWS)}")
+    parser.add_argument("--filter", default="None", help=f"any of {','.join(FILTERS)}")
+    parser.add_argument("--cutoff", default="50")
+    parser.add_argument("--order", default="4")
+    parser.add_argument("--pcm", default="Unipolar", help=f"any of {','.join(PCM_ENCODINGS)}")
+    parser.add_argument("--duration", type=float, default=0.5)
+    # The metrics do not depend on the waveform resolution; 2 is the least
+    # every line code (Manchester, RZ) can be drawn with
+    parser.add_argument("--samples-per-bit", type=int, default=2)
+    parser.add_argument("--processes", type=int, default=None,
+                        help="worker processes (default: one per CPU; 0 runs inline)")
+    parser.add_argument("--seed", type=int, default=0, help="seed for the noise generators")
+    args = parser.parse_args(argv)
+
+    kinds = {"bits": int, "order": int, "quantizer": str, "companding": str, "window": str,
+             "filter": str, "pcm": str}
+    grid = {name: parse_values(getattr(args, name), kinds.get(name, float))
+            for name in SWEEP_FIELDS}
+    for name, allowed in (("quantizer", QUANTIZER_MODES), ("companding", COMPANDING),
+                          ("window", WINDOWS), ("filter", FILTERS), ("pcm", PCM_ENCODINGS)):
+        bad = set(grid[name]) - set(allowed)
+        if bad:
+            parser.error(f"unknown {name}: {', '.join(sorted(bad))}")
+
+    start = time.perf_counter()
+    base = DSPParams(duration=args.duration, samples_per_bit=args.samples_per_bit)
+    table = sweep(grid, base, args.processes, args.seed)
+    write_table(table, args.output)
+    rows = len(next(iter(table.values())))
+    print(f"{rows} configurations in {time.perf_counter() - start:.2f} s -> "
+          f"{os.path.abspath(args.output)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
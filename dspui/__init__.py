@@ -0,0 +1,8 @@
+"""Qt and matplotlib helpers shared by the DSP apps' views."""
+from .blit import BlitManager, fit_limits, overlay
+from .lod import LODLine
+from .scheduler import UpdateScheduler
+from .worker import BackgroundTask, ComputeWorker
+
+__all__ = ["BackgroundTask", "BlitManager", "ComputeWorker", "fit_limits", "LODLine", "overlay",
+           "UpdateScheduler"]
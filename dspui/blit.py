@@ -0,0 +1,108 @@
+"""Persistent-artist rendering with blitting for matplotlib Qt canvases.
+
+Axes and artists are created once; each frame only pushes new data into the
+animated artists and blits them over a cached background. The full figure is
+redrawn only when the layout changes (axis limits, titles, canvas size).
+"""
+import weakref
+
+import numpy as np
+
+# Consecutive calls each axis has spent with the data filling under half of
+# its span, per axes: [x, y]
+_shrink_counts = weakref.WeakKeyDictionary()
+
+
+class BlitManager:
+    def __init__(self, canvas, artists=()):
+        self.canvas = canvas
+        self.figure = canvas.figure
+        self._background = None
+        self._artists = []
+        for artist in artists:
+            self.add_artist(artist)
+        canvas.mpl_connect('draw_event', self._on_draw)
+
+    def add_artist(self, artist):
+        artist.set_animated(True)
+        self._artists.append(artist)
+        return artist
+
+    def invalidate(self):
+        # Force a full redraw (and a fresh background) on the next update
+        self._background = None
+
+    def _on_draw(self, event):
+        self._background = self.canvas.copy_from_bbox(self.figure.bbox)
+        self._draw_animated()
+
+    def _draw_animated(self):
+        for artist in self._artists:
+            self.figure.draw_artist(artist)
+
+    def update(self):
+        if self._background is None:
+            self.canvas.draw()
+        else:
+            self.canvas.restore_region(self._background)
+            self._draw_animated()
+            self.canvas.blit(self.figure.bbox)
+
+
+def overlay(x, rows):
+    """Lay out ``rows`` (one per channel, sharing ``x``) as one NaN-separated line.
+
+    Returns ``(xs, ys)`` for a single Line2D, so any number of overlaid
+    channels costs one artist rather than one per channel.
+    """
+    rows = np.atleast_2d(rows)
+    gap = np.full((rows.shape[0], 1), np.nan)
+    xs = np.broadcast_to(np.asarray(x, dtype=np.float64), rows.shape)
+    return np.hstack((xs, gap)).ravel(), np.hstack((rows, gap)).ravel()
+
+
+def fit_limits(ax, x, y, margin=0.05, patience=0):
+    """Resize ``ax`` around the data when it no longer fits comfortably.
+
+    Limits are left alone while the data stays inside them and fills at least
+    half of the span, so small frame-to-frame changes never force a relayout.
+    Data that leaves the limits only pushes out the side it crossed. With
+    ``patience``, limits shrink back only once the data has filled less than
+    half of them for that many consecutive calls, so data that wanders (an
+    animated unwrapped phase, say) settles on one range instead of flipping.
+    Returns True when the limits changed.
+    """
+    counts = _shrink_counts.get(ax)
+    if counts is None:
+        # First fit: the axes' default limits say nothing about the data
+        counts = _shrink_counts[ax] = [patience, patience]
+    changed = False
+    for axis, (data, get, set_) in enumerate(((x, ax.get_xlim, ax.set_xlim),
+                                              (y, ax.get_ylim, ax.set_ylim))):
+        data = np.asarray(data)
+        data = data[np.isfinite(data)]
+        if data.size == 0:
+            continue
+        lo, hi = float(data.min()), float(data.max())
+        if hi <= lo:
+            # Flat data: centre a unit-ish window on it
+            half = 0.5 * max(abs(hi), 1.0)
+            lo, hi = lo - half, hi + half
+        span = hi - lo
+        cur_lo, cur_hi = get()
+        inside = cur_lo <= lo and hi <= cur_hi
+        if inside and span >= 0.5 * (cur_hi - cur_lo):
+            counts[axis] = 0
+            continue
+        if inside:
+            counts[axis] += 1
+            if counts[axis] < patience:
+                continue
+            set_(lo - margin * span, hi + margin * span)
+        elif counts[axis] >= patience:
+            set_(lo - margin * span, hi + margin * span)
+        else:
+            set_(min(cur_lo, lo - margin * span), max(cur_hi, hi + margin * span))
+        counts[axis] = 0
+        changed = True
+    return changed
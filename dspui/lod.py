@@ -0,0 +1,73 @@
+"""Matplotlib artists that draw long series at screen resolution.
+
+``LODLine`` keeps a ``LODPyramid`` behind a ``Line2D`` and re-queries it
+whenever the axes' x-limits change, so zooming and panning stay at about two
+points per pixel column. ``stem`` falls back to a single ``LineCollection``
+once a stem plot would need more artists than the axes can usefully show.
+"""
+import numpy as np
+from matplotlib.collections import LineCollection
+
+from dspcore.lod import LODPyramid, minmax_decimate
+
+# Points drawn per pixel column of the axes
+POINTS_PER_PIXEL = 2
+# Above this many samples ax.stem is replaced by one LineCollection
+STEM_THRESHOLD = 200
+
+
+def _max_points(ax):
+    return max(int(ax.bbox.width * POINTS_PER_PIXEL), 2)
+
+
+class LODLine:
+    def __init__(self, line):
+        self.line = line
+        self.pyramid = None
+        line.axes.callbacks.connect('xlim_changed', self._on_xlim)
+
+    def set_data(self, x, y):
+        self.set_pyramid(LODPyramid(x, y))
+
+    def set_pyramid(self, pyramid):
+        # For pyramids built off the GUI thread
+        self.pyramid = pyramid
+        self.refresh()
+
+    def refresh(self):
+        if self.pyramid is None:
+            return
+        x0, x1 = sorted(self.line.axes.get_xlim())
+        self.line.set_data(*self.pyramid.query(x0, x1, _max_points(self.line.axes)))
+
+    def _on_xlim(self, ax):
+        self.refresh()
+
+
+def plot(ax, x, y, *args, **kwargs):
+    # ax.plot() for one long series; returns the LODLine driving the Line2D
+    x, y = np.asarray(x), np.asarray(y)
+    line, = ax.plot([], [], *args, **kwargs)
+    lod = LODLine(line)
+    if x.size:
+        ax.update_datalim([(x[0], y.min()), (x[-1], y.max())])
+        ax.autoscale_view()
+    lod.set_data(x, y)
+    return lod
+
+
+def stem(ax, x, y, threshold=STEM_THRESHOLD, label=None):
+    """ax.stem() for short series, one stem collection for long ones."""
+    x, y = np.asarray(x), np.asarray(y)
+    if x.size <= threshold:
+        return ax.stem(x, y, label=label)
+    dx, dy = minmax_decimate(x, y, _max_points(ax))
+    segments = np.zeros((dx.size, 2, 2))
+    segments[:, :, 0] = dx[:, None]
+    segments[:, 1, 1] = dy
+    stems = LineCollection(segments, colors='C0', label=label)
+    ax.add_collection(stems)
+    ax.axhline(0, color='C3', linewidth=1)
+    ax.update_datalim([(x[0], min(y.min(), 0)), (x[-1], max(y.max(), 0))])
+    ax.autoscale_view()
+    return stems
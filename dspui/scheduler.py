@@ -0,0 +1,51 @@
+"""Coalescing update scheduler for control-driven redraws.
+
+Controls call ``request()`` instead of the redraw itself. The first request
+arms a single-shot timer; every request arriving before it fires is merged
+into the same update, which then reads the controls' latest values, so
+superseded intermediate states are never computed.
+"""
+from PySide6.QtCore import QObject, QTimer
+
+
+class UpdateScheduler(QObject):
+    # One frame at 60 Hz
+    DEFAULT_LATENCY_MS = 16
+
+    def __init__(self, callback, latency_ms=DEFAULT_LATENCY_MS, parent=None):
+        super().__init__(parent)
+        self.callback = callback
+        self.requests = 0
+        self.updates = 0
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self._fire)
+        self.set_latency(latency_ms)
+
+    def latency(self):
+        return self._timer.interval()
+
+    def set_latency(self, latency_ms):
+        # Upper bound between the first change in a burst and its update
+        self._timer.setInterval(max(0, int(latency_ms)))
+
+    def request(self, *args):
+        # Extra arguments from valueChanged/currentTextChanged are ignored
+        self.requests += 1
+        if not self._timer.isActive():
+            self._timer.start()
+
+    def pending(self):
+        return self._timer.isActive()
+
+    def flush(self):
+        if self._timer.isActive():
+            self._timer.stop()
+            self._fire()
+
+    def cancel(self):
+        self._timer.stop()
+
+    def _fire(self):
+        self.updates += 1
+        self.callback()
@@ -0,0 +1,134 @@
+"""Background compute worker with stale-job cancellation.
+
+Every ``submit()`` bumps a generation counter. Jobs that are superseded
+before they start are skipped, and results whose generation is no longer the
+latest are dropped, so the GUI only ever sees the newest parameters. Results
+and errors are delivered as Qt signals on the thread that owns the worker.
+``BackgroundTask`` covers the other case: a single long job, such as an
+export, that reports progress and can be cancelled.
+"""
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Signal
+
+
+class _JobSignals(QObject):
+    finished = Signal(int, object)
+    failed = Signal(int, object)
+
+
+class _Job(QRunnable):
+    def __init__(self, worker, generation, fn, args):
+        super().__init__()
+        self.worker = worker
+        self.generation = generation
+        self.fn = fn
+        self.args = args
+
+    def run(self):
+        if self.generation != self.worker.generation:
+            return
+        try:
+            result = self.fn(*self.args)
+        except Exception as exc:
+            self.worker._signals.failed.emit(self.generation, exc)
+        else:
+            self.worker._signals.finished.emit(self.generation, result)
+
+
+class ComputeWorker(QObject):
+    resultReady = Signal(object)
+    failed = Signal(object)
+
+    def __init__(self, max_threads=1, parent=None):
+        super().__init__(parent)
+        self.generation = 0
+        self.completed = 0
+        self.discarded = 0
+        # A private pool so queued stale jobs never wait behind unrelated work
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(max_threads)
+        self._signals = _JobSignals(self)
+        self._signals.finished.connect(self._on_finished)
+        self._signals.failed.connect(self._on_failed)
+        # Generation of the last job that reported back while still current
+        self._settled = 0
+
+    def submit(self, fn, *args):
+        """Run ``fn(*args)`` on the pool; supersedes every earlier job."""
+        self.generation += 1
+        self.pool.start(_Job(self, self.generation, fn, args))
+        return self.generation
+
+    def busy(self):
+        # The newest job is never skipped, so it always reports back
+        return self._settled != self.generation
+
+    def wait(self, msecs=-1):
+        return self.pool.waitForDone(msecs)
+
+    def _on_finished(self, generation, result):
+        if generation != self.generation:
+            self.discarded += 1
+            return
+        self._settled = generation
+        self.completed += 1
+        self.resultReady.emit(result)
+
+    def _on_failed(self, generation, exc):
+        if generation != self.generation:
+            self.discarded += 1
+            return
+        self._settled = generation
+        self.failed.emit(exc)
+
+
+class _TaskSignals(QObject):
+    progress = Signal(int, int)
+    finished = Signal(object)
+    failed = Signal(object)
+
+
+class _TaskRunnable(QRunnable):
+    def __init__(self, task):
+        super().__init__()
+        self.task = task
+
+    def run(self):
+        task = self.task
+        try:
+            result = task.fn(*task.args, progress=task._signals.progress.emit,
+                             cancelled=task.is_cancelled)
+        except Exception as exc:
+            task._signals.failed.emit(exc)
+        else:
+            task._signals.finished.emit(result)
+
+
+class BackgroundTask(QObject):
+    """One long-running job with progress reporting and cooperative cancel.
+
+    ``fn`` is called as ``fn(*args, progress=..., cancelled=...)``, where
+    ``progress(done, total)`` may be called from the worker thread and
+    ``cancelled()`` should be polled between units of work.
+    """
+    progress = Signal(int, int)
+    finished = Signal(object)
+    failed = Signal(object)
+
+    def __init__(self, fn, *args, parent=None):
+        super().__init__(parent)
+        self.fn = fn
+        self.args = args
+        self._cancelled = False
+        self._signals = _TaskSignals(self)
+        self._signals.progress.connect(self.progress)
+        self._signals.finished.connect(self.finished)
+        self._signals.failed.connect(self.failed)
+
+    def start(self, pool=None):
+        (pool if pool is not None else QThreadPool.globalInstance()).start(_TaskRunnable(self))
+
+    def cancel(self):
+        self._cancelled = True
+
+    def is_cancelled(self):
+        return self._cancelled